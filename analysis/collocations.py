@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Collocation Statistics for Singapore Budget Speeches
+
+Scores bigrams and trigrams by how much more often their words appear together than
+chance would predict, for each Finance Minister (or any grouping of sentences):
+1. PMI - pointwise mutual information, log2(O / E)
+2. LLR - log-likelihood ratio, 2 * (O ln(O / E) - (O - E)), signed by O - E
+3. t-score - (O - E) / sqrt(O)
+
+O is a phrase's count in the group and E = N * p(w1) * ... * p(wn) its expected count
+from the group's word frequencies (N words in the group). Counts come from the n-gram
+store (see ngram_analysis.py), so every measure is a few array operations per corpus.
+"""
+
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+from ngram_analysis import (
+    GROUPINGS,
+    MAX_N,
+    OUTPUT_DIR,
+    WORD_BITS,
+    NgramEncoder,
+    NgramTable,
+    load_ngram_table,
+    top_k_order,
+)
+
+MEASURES = ["llr", "pmi", "t_score"]
+
+
+def association_scores(observed: np.ndarray, expected: np.ndarray) -> dict[str, np.ndarray]:
+    """PMI, log-likelihood ratio and t-score of observed against expected counts."""
+    ratio = observed / expected
+    llr = 2 * (observed * np.log(ratio) - (observed - expected))
+    return {
+        "llr": np.where(observed >= expected, llr, -llr),
+        "pmi": np.log2(ratio),
+        "t_score": (observed - expected) / np.sqrt(observed),
+    }
+
+
+def group_collocations(
+    table: NgramTable, group, min_count: int = 5
+) -> tuple[pd.Index, np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+    """
+    Association scores of every phrase used at least min_count times in a group.
+
+    Returns the group names and, sorted by group, aligned arrays of group index,
+    phrase index, count, first row (corpus order) and a dict of scores per measure.
+    """
+    names, groups, phrases, counts, first = table.group_counts(group)
+    _, word_groups, words, word_counts, _ = table.group_counts(group, words=True)
+    totals = np.bincount(word_groups, weights=word_counts, minlength=len(names))
+
+    # Minimum frequency threshold
+    frequent = counts >= min_count
+    groups, phrases, counts, first = (
+        groups[frequent],
+        phrases[frequent],
+        counts[frequent],
+        first[frequent],
+    )
+
+    # Word counts are sorted by (group, word), so one searchsorted finds any word's count
+    word_keys = (word_groups.astype(np.int64) << WORD_BITS) | words
+    group_keys = groups.astype(np.int64) << WORD_BITS
+    group_totals = totals[groups]
+
+    # Expected count under independence: N * p(w1) * ... * p(wn)
+    expected = group_totals.copy()
+    phrase_words = NgramEncoder.unpack(table.phrase_keys[phrases])
+    for j in range(MAX_N):
+        present = phrase_words[:, j] > 0
+        index = np.searchsorted(word_keys, group_keys | phrase_words[:, j])
+        index = np.minimum(index, len(word_keys) - 1)
+        probability = word_counts[index] / group_totals
+        expected = np.where(present, expected * probability, expected)
+
+    scores = association_scores(counts.astype(float), expected)
+    return names, groups, phrases, counts, first, scores
+
+
+def collocations(
+    group="minister",
+    measure: str = "llr",
+    top_k: int = 15,
+    min_count: int = 5,
+    table: NgramTable | None = None,
+) -> dict:
+    """
+    Top collocations per group.
+
+    Args:
+        group: Column of the n-gram table's sentences (minister, year, decade,
+            section_title, ministry_topic) or labels aligned with them
+        measure: Ranking measure, one of MEASURES
+        top_k: Number of phrases to return per group
+        min_count: Minimum uses of a phrase within a group
+
+    Returns:
+        Dictionary of group -> list of {"phrase", "count", "llr", "pmi", "t_score"}
+    """
+    if measure not in MEASURES:
+        raise ValueError(f"Unknown measure {measure!r}, expected one of {MEASURES}")
+    table = table if table is not None else load_ngram_table()
+    names, groups, phrases, counts, first, scores = group_collocations(table, group, min_count)
+    bounds = np.searchsorted(groups, np.arange(len(names) + 1))
+
+    results = {}
+    for g, name in enumerate(names):
+        rows = np.arange(bounds[g], bounds[g + 1])
+        ranking = np.round(scores[measure][rows], 4)
+        results[name] = [
+            {
+                "phrase": table.encoder.decode(int(table.phrase_keys[phrases[i]])),
+                "count": int(counts[i]),
+                **{m: round(float(scores[m][i]), 4) for m in MEASURES},
+            }
+            for i in rows[top_k_order(ranking, first[rows], top_k)]
+        ]
+
+    return results
+
+
+def export_collocations_json(measure: str = "llr", top_k: int = 15, min_count: int = 5):
+    """Export minister collocations to JSON for web visualization."""
+    print("📊 Scoring minister collocations...")
+
+    table = load_ngram_table()
+    minister_phrases = collocations("minister", measure, top_k, min_count, table=table)
+    minister_years = table.sentences.groupby("minister", sort=False)["year"].unique()
+
+    results = {
+        "ministers": {
+            minister: {
+                "years": f"{minister_years[minister].min()}-{minister_years[minister].max()}",
+                "phrases": phrases,
+            }
+            for minister, phrases in minister_phrases.items()
+        },
+        "metadata": {"measure": measure, "min_count": min_count, "top_k": top_k},
+    }
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output_path = OUTPUT_DIR / "minister_collocations.json"
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    size_kb = output_path.stat().st_size / 1024
+    print(f"  ✓ Exported minister_collocations.json ({size_kb:.1f} KB)")
+
+    print("\n  Top collocation by minister:")
+    for minister, data in results["ministers"].items():
+        top_phrase = data["phrases"][0] if data["phrases"] else {"phrase": "N/A"}
+        print(f"    {minister}: \"{top_phrase['phrase']}\"")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collocations in budget speeches")
+    parser.add_argument(
+        "--group",
+        choices=GROUPINGS,
+        help="Print collocations per group instead of exporting minister_collocations.json",
+    )
+    parser.add_argument("--measure", choices=MEASURES, default="llr", help="Ranking measure")
+    parser.add_argument("--top-k", type=int, default=15, help="Phrases per group")
+    parser.add_argument("--min-count", type=int, default=5, help="Minimum uses per group")
+    args = parser.parse_args()
+
+    if not args.group:
+        export_collocations_json(args.measure, args.top_k, args.min_count)
+        return
+
+    print(f"📊 Collocations by {args.group} ({args.measure})...")
+    results = collocations(args.group, args.measure, args.top_k, args.min_count)
+    for name, phrases in results.items():
+        print(f"\n  {name}:")
+        for entry in phrases:
+            scores = ", ".join(f"{m} {entry[m]}" for m in MEASURES)
+            print(f"    {entry['phrase']} ({entry['count']}; {scores})")
+
+
+if __name__ == "__main__":
+    main()
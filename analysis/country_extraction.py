@@ -3,10 +3,17 @@ Country and Region Extraction from Singapore Budget Speeches
 Extracts mentions of countries and regions from parquet files
 """
 
+import argparse
+import heapq
 import json
 import re
-from collections import defaultdict
+import zlib
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import combinations, repeat
 from pathlib import Path
+from typing import Iterable, Optional
 
 import pandas as pd
 
@@ -1226,94 +1233,267 @@ def get_minister_for_year(year: int) -> str:
     return "Unknown"
 
 
-def process_parquet_files(parquet_dir: Path, patterns: dict) -> dict:  # type: ignore[type-arg]
-    """Process all parquet files and extract country mentions."""
-    results: dict = {
-        "by_year": defaultdict(lambda: defaultdict(list)),
-        "by_country": defaultdict(lambda: defaultdict(list)),
-        "totals": defaultdict(int),
-        "year_totals": defaultdict(lambda: defaultdict(int)),
-        "sentences": [],  # For expandable context
+# Sentences kept per (country, year) for the expandable quotes view
+SAMPLE_SIZE = 10
+
+
+def sample_priority(country: str, sentence_id: str) -> int:
+    """Deterministic pseudo-random priority for bottom-k sampling."""
+    return zlib.crc32(f"{country}|{sentence_id}".encode("utf-8"))
+
+
+def add_sample(samples: list, priority: int, record: dict, sample_size: int):  # type: ignore[type-arg]
+    """
+    Offer a record to a bounded sample, keeping the sample_size lowest priorities.
+
+    `samples` is a heap of (-priority, sentence_id, record) so the root is the entry
+    to evict. Keeping the k smallest hash priorities is a uniform sample without
+    replacement that does not depend on insertion order.
+    """
+    item = (-priority, record["sentence_id"], record)
+    if len(samples) < sample_size:
+        heapq.heappush(samples, item)
+    elif item > samples[0]:
+        heapq.heapreplace(samples, item)
+
+
+def sorted_samples(samples: list) -> list[dict]:  # type: ignore[type-arg]
+    """Return sampled records in speech order."""
+    return [record for _, _, record in sorted(samples, key=lambda x: x[2]["sentence_order"])]
+
+
+def empty_results(sample_size: int = SAMPLE_SIZE) -> dict:  # type: ignore[type-arg]
+    """Create an empty (picklable) results structure."""
+    return {
+        "sample_size": sample_size,
+        # country -> year -> bounded sample heap (see add_sample)
+        "by_country": {},
+        "totals": Counter(),
+        "year_totals": {},  # year -> Counter of country mentions
+        # Mention counts keyed by (country, year, minister, section)
+        "cube": Counter(),
+        # Sentence-level co-occurrence counts keyed by (country_a, country_b, year)
+        "co_mentions": Counter(),
     }
 
+
+def extract_year(
+    parquet_file: Path, patterns: dict, sample_size: int = SAMPLE_SIZE  # type: ignore[type-arg]
+) -> dict:  # type: ignore[type-arg]
+    """Extract country mentions from one year's parquet file as a partial result."""
+    results = empty_results(sample_size)
+    year = int(parquet_file.stem)
+    minister = get_minister_for_year(year)
+
+    df = pd.read_parquet(parquet_file)
+
+    for _, row in df.iterrows():
+        text = row["sentence_text"]
+        sentence_id = row["sentence_id"]
+        section = row.get("section_title", None)
+
+        mentions = extract_country_mentions(text, patterns)
+
+        if mentions:
+            for country, matched_terms in mentions.items():
+                samples = results["by_country"].setdefault(country, {}).setdefault(year, [])
+                add_sample(
+                    samples,
+                    sample_priority(country, sentence_id),
+                    {
+                        "sentence_id": sentence_id,
+                        "sentence_order": int(row["sentence_order"]),
+                        "text": text,
+                        "section": section,
+                        "matched_terms": matched_terms,
+                        "minister": minister,
+                    },
+                    sample_size,
+                )
+
+                # Update counts
+                results["totals"][country] += 1
+                results["year_totals"].setdefault(year, Counter())[country] += 1
+                results["cube"][(country, year, minister, section or "")] += 1
+
+            # Countries named together in the same sentence
+            for country_a, country_b in combinations(sorted(mentions), 2):
+                results["co_mentions"][(country_a, country_b, year)] += 1
+
+    return results
+
+
+def merge_into(target: dict, part: dict) -> dict:  # type: ignore[type-arg]
+    """
+    Fold a partial result into target in place (and return target).
+
+    Keeps first-seen key order, so folding per-year partials in year order reproduces
+    a serial run exactly. Samples for the same (country, year) keep the lowest
+    priorities of both, up to target's sample_size, so accumulating one partial costs
+    only that partial's size, however many have been folded in before.
+    """
+    sample_size = target["sample_size"]
+
+    for country, yearly in part["by_country"].items():
+        target_yearly = target["by_country"].setdefault(country, {})
+        for year, samples in yearly.items():
+            target_samples = target_yearly.setdefault(year, [])
+            for neg_priority, _, record in samples:
+                add_sample(target_samples, -neg_priority, record, sample_size)
+
+    for year, counts in part["year_totals"].items():
+        target["year_totals"].setdefault(year, Counter()).update(counts)
+
+    for counter_key in ("totals", "cube", "co_mentions"):
+        target[counter_key].update(part[counter_key])
+
+    return target
+
+
+def process_parquet_files(
+    parquet_dir: Path,
+    patterns: dict,  # type: ignore[type-arg]
+    workers: Optional[int] = None,
+    sample_size: int = SAMPLE_SIZE,
+) -> dict:  # type: ignore[type-arg]
+    """
+    Process all parquet files and extract country mentions.
+
+    Years are extracted in a process pool (one task per parquet file) and the partial
+    results are reduced in year order. Pass workers=1 to run serially in-process.
+    Only `sample_size` sentences are kept per (country, year), so memory grows with
+    countries x years rather than with the number of mentions.
+    """
     parquet_files = sorted(parquet_dir.glob("*.parquet"))
     print(f"Found {len(parquet_files)} parquet files")
 
-    for pf in parquet_files:
-        year = int(pf.stem)
-        print(f"Processing {year}...")
-
-        df = pd.read_parquet(pf)
-
-        minister = get_minister_for_year(year)
-
-        for _, row in df.iterrows():
-            text = row["sentence_text"]
-            sentence_id = row["sentence_id"]
-            section = row.get("section_title", None)
-
-            mentions = extract_country_mentions(text, patterns)
-
-            if mentions:
-                for country, matched_terms in mentions.items():
-                    # Store by year
-                    results["by_year"][year][country].append(
-                        {
-                            "sentence_id": sentence_id,
-                            "text": text,
-                            "section": section,
-                            "matched_terms": matched_terms,
-                            "minister": minister,
-                        }
-                    )
-
-                    # Store by country
-                    results["by_country"][country][year].append(
-                        {
-                            "sentence_id": sentence_id,
-                            "text": text,
-                            "section": section,
-                            "matched_terms": matched_terms,
-                            "minister": minister,
-                        }
-                    )
-
-                    # Update counts
-                    results["totals"][country] += 1
-                    results["year_totals"][year][country] += 1
+    if workers == 1:
+        partials: Iterable[dict] = (extract_year(pf, patterns, sample_size) for pf in parquet_files)
+        return reduce(merge_into, partials, empty_results(sample_size))
+
+    results = empty_results(sample_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map() yields in submission order, keeping the reduction deterministic
+        tasks = executor.map(extract_year, parquet_files, repeat(patterns), repeat(sample_size))
+        for pf, partial in zip(parquet_files, tasks):
+            print(f"Processed {pf.stem}")
+            merge_into(results, partial)
 
     return results
 
 
+def build_aggregation_cube(results: dict) -> dict:  # type: ignore[type-arg]
+    """
+    Build a compact country x year x minister x section cube with precomputed rollups.
+
+    Cells are dictionary-encoded as [country, year, minister, section, count] index rows,
+    and the rollups cover the slices the global page charts so each one is a direct lookup.
+    """
+    columns = ["country", "year", "minister", "section"]
+    cube = pd.DataFrame(
+        [(*key, count) for key, count in results["cube"].items()],
+        columns=columns + ["count"],
+    )
+    dimensions = {col: sorted(cube[col].unique().tolist()) for col in columns}
+    years = dimensions["year"]
+
+    cells = cube.copy()
+    for col in columns:
+        cells[col] = pd.Categorical(cube[col], categories=dimensions[col]).codes
+    cells = cells.sort_values(columns)
+
+    region_of = {c: region for region, countries in REGIONS.items() for c in countries}
+    cube["region"] = cube["country"].map(region_of)
+
+    def totals(by: str) -> dict[str, int]:
+        return {k: int(v) for k, v in cube.groupby(by)["count"].sum().items()}
+
+    def by_year(by: str) -> dict[str, list[int]]:
+        table = cube.pivot_table(index=by, columns="year", values="count", aggfunc="sum")
+        table = table.reindex(columns=years, fill_value=0).fillna(0).astype(int)
+        return {k: row.tolist() for k, row in table.iterrows()}
+
+    def by_minister(by: str) -> dict[str, dict[str, int]]:
+        grouped = cube.groupby([by, "minister"])["count"].sum()
+        nested: dict[str, dict[str, int]] = {}
+        for (key, minister), count in grouped.items():
+            nested.setdefault(key, {})[minister] = int(count)
+        return nested
+
+    year_totals = cube.groupby("year")["count"].sum().reindex(years, fill_value=0)
+
+    return {
+        "dimensions": dimensions,
+        "columns": columns + ["count"],
+        "cells": cells.values.tolist(),
+        "rollups": {
+            "country": totals("country"),
+            "country_year": by_year("country"),
+            "country_minister": by_minister("country"),
+            "region": totals("region"),
+            "region_year": by_year("region"),
+            "region_minister": by_minister("region"),
+            "minister": totals("minister"),
+            "year": [int(v) for v in year_totals],
+        },
+    }
+
+
+def build_co_mention_table(results: dict) -> dict:  # type: ignore[type-arg]
+    """
+    Build symmetric country co-occurrence counts (sentences naming both countries).
+
+    Both directions are stored so that co_mentions[a][b] is a direct lookup, overall and per year.
+    """
+    totals: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    by_year: dict[int, dict[str, dict[str, int]]] = defaultdict(
+        lambda: defaultdict(lambda: defaultdict(int))
+    )
+
+    for (country_a, country_b, year), count in sorted(results["co_mentions"].items()):
+        for first, second in ((country_a, country_b), (country_b, country_a)):
+            totals[first][second] += count
+            by_year[year][first][second] += count
+
+    return {
+        "total_pairs": len({(a, b) for a, b, _ in results["co_mentions"]}),
+        "co_mentions": {c: dict(others) for c, others in sorted(totals.items())},
+        "by_year": {
+            year: {c: dict(others) for c, others in sorted(pairs.items())}
+            for year, pairs in sorted(by_year.items())
+        },
+    }
+
+
 def generate_output_json(results: dict, output_dir: Path):  # type: ignore[type-arg]
     """Generate JSON files for the website."""
 
+    cube = build_aggregation_cube(results)
+    co_mentions = build_co_mention_table(results)
+
     # 1. Overview file with totals and regional aggregates
     overview: dict = {
         "total_mentions": sum(results["totals"].values()),
         "countries_mentioned": len(results["totals"]),
         "by_region": {},
         "country_totals": dict(sorted(results["totals"].items(), key=lambda x: -x[1])[:50]),
-        "years": sorted(results["by_year"].keys()),
+        "years": sorted(results["year_totals"].keys()),
     }
 
-    # Calculate regional totals
+    # Regional totals come straight from the cube rollups
+    country_totals = cube["rollups"]["country"]
+    region_totals = cube["rollups"]["region"]
     for region, countries in REGIONS.items():
-        region_total = sum(results["totals"].get(c, 0) for c in countries)
-        if region_total > 0:
+        if region_totals.get(region, 0) > 0:
             overview["by_region"][region] = {
-                "total": region_total,
-                "countries": {
-                    c: results["totals"].get(c, 0)
-                    for c in countries
-                    if results["totals"].get(c, 0) > 0
-                },
+                "total": region_totals[region],
+                "countries": {c: country_totals[c] for c in countries if c in country_totals},
             }
 
     # 2. Time series data for charts
     time_series: dict = {"years": [], "countries": {}}
 
-    all_years = sorted(results["by_year"].keys())
+    all_years = sorted(results["year_totals"].keys())
     time_series["years"] = all_years
 
     # Get top 20 most mentioned countries for time series
@@ -1339,7 +1519,7 @@ def generate_output_json(results: dict, output_dir: Path):  # type: ignore[type-
                 "by_year": {},
             }
 
-            for year, sentences in yearly_data.items():
+            for year, samples in yearly_data.items():
                 country_details[country]["by_year"][year] = [
                     {
                         "text": s["text"],
@@ -1347,7 +1527,7 @@ def generate_output_json(results: dict, output_dir: Path):  # type: ignore[type-
                         "terms": s["matched_terms"],
                         "minister": s.get("minister", "Unknown"),
                     }
-                    for s in sentences[:10]  # Limit to 10 per year for file size
+                    for s in sorted_samples(samples)
                 ]
 
     # 4. Map data with ISO codes for choropleth
@@ -1376,15 +1556,32 @@ def generate_output_json(results: dict, output_dir: Path):  # type: ignore[type-
     with open(output_dir / "global_map_data.json", "w") as f:
         json.dump(map_data, f, indent=2)
 
+    with open(output_dir / "global_cube.json", "w") as f:
+        json.dump(cube, f, separators=(",", ":"))
+
+    with open(output_dir / "global_co_mentions.json", "w") as f:
+        json.dump(co_mentions, f, indent=2)
+
     print(f"\nGenerated files in {output_dir}:")
     print(f"  - global_overview.json ({overview['total_mentions']} total mentions)")
     print(f"  - global_time_series.json ({len(time_series['countries'])} countries)")
     print(f"  - global_country_details.json ({len(country_details)} countries with details)")
     print(f"  - global_map_data.json ({len(map_data)} countries for map)")
+    print(f"  - global_cube.json ({len(cube['cells'])} cells)")
+    print(f"  - global_co_mentions.json ({co_mentions['total_pairs']} country pairs)")
 
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Extract country mentions for the global page")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count, 1 = serial)",
+    )
+    args = parser.parse_args()
+
     base_dir = Path(__file__).parent.parent
     parquet_dir = base_dir / "output_processor"
     output_dir = base_dir / "docs" / "data" / "summary"
@@ -1393,7 +1590,7 @@ def main():
     patterns = build_search_patterns()
 
     print("\nExtracting country mentions from parquet files...")
-    results = process_parquet_files(parquet_dir, patterns)
+    results = process_parquet_files(parquet_dir, patterns, workers=args.workers)
 
     print("\nGenerating JSON output files...")
     generate_output_json(results, output_dir)
@@ -4,10 +4,14 @@ Export CSV data to JSON for web visualisation
 Generates lightweight summary JSONs and detailed shards for progressive loading
 """
 
+import argparse
 import json
+import shutil
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+from topic_classifier import load_classified_sentences, topic_display_name
 
 # Paths
 ANALYSIS_DIR = Path(__file__).parent
@@ -15,6 +19,17 @@ DATA_DIR = ANALYSIS_DIR.parent / "docs" / "data"
 SUMMARY_DIR = DATA_DIR / "summary"
 DETAILED_DIR = DATA_DIR / "detailed"
 SEARCH_DIR = DATA_DIR / "search-index"
+INVERTED_DIR = SEARCH_DIR / "inverted"
+
+# Inverted search index: tokenizer (keep in sync with docs/assets/search.js), BM25
+# parameters, characters of the term prefix that names a postings shard, and sentences
+# per text block
+TOKEN_PATTERN = r"[a-z0-9]+"
+BM25_K1 = 1.2
+BM25_B = 0.75
+WEIGHT_SCALE = 100
+TERM_PREFIX_LENGTH = 2
+TEXT_BLOCK_SIZE = 500
 
 
 def ensure_directories():
@@ -289,13 +304,46 @@ def export_yearly_overview():
     print(f"  ✓ Exported yearly_overview.json ({size_kb:.1f} KB)")
 
 
+def export_linguistic_windows():
+    """Export the sliding-window linguistic series as one compact array per metric and year"""
+    print("\n📈 Exporting linguistic windows...")
+
+    windows_path = ANALYSIS_DIR / "linguistic_windows.csv"
+    if not windows_path.exists():
+        print("  ⚠️  linguistic_windows.csv not found, run linguistic_features.py first")
+        return
+
+    df = pd.read_csv(windows_path).sort_values(["year", "start"])
+    if not {"window_size", "window_step"} <= set(df.columns):
+        print("  ⚠️  linguistic_windows.csv has no window size/step, re-run linguistic_features.py")
+        return
+    metrics = ["temporal_ratio", "certainty_ratio", "passive_ratio", "ttr"]
+
+    series = {
+        "window": int(df["window_size"].iloc[0]),
+        "step": int(df["window_step"].iloc[0]),
+        "by_year": {},
+    }
+    for year, group in df.groupby("year"):
+        year_data = {"start": group["start"].astype(int).tolist()}
+        for metric in metrics:
+            year_data[metric] = group[metric].round(4).tolist()
+        series["by_year"][str(int(year))] = year_data
+
+    output_path = SUMMARY_DIR / "linguistic_windows.json"
+    with open(output_path, "w") as f:
+        json.dump(series, f, separators=(",", ":"))
+
+    size_kb = output_path.stat().st_size / 1024
+    print(f"  ✓ Exported linguistic_windows.json ({size_kb:.1f} KB, {len(df):,} windows)")
+
+
 def export_search_index():
     """Export search index with progressive loading support using parquet files"""
     print("\n🔍 Exporting search index...")
 
     # Use parquet files as the source (cleaner, no duplicates)
     parquet_dir = ANALYSIS_DIR.parent / "output_processor"
-    all_sentences = []
 
     # Minister periods for attribution (from speech_links.py)
     minister_periods = {
@@ -318,329 +366,41 @@ def export_search_index():
                 return name
         return "Unknown"
 
-    # Topic keywords for classification - aligned with ministry names in ministries_overview
-    topic_keywords = {
-        "Defence": [
-            "defence",
-            "defense",
-            "military",
-            "armed forces",
-            "army",
-            "navy",
-            "air force",
-            "national service",
-            "ns",
-            "mindef",
-            "saf",
-            "security",
-            "terrorism",
-            "homeland",
-        ],
-        "Education": [
-            "education",
-            "school",
-            "university",
-            "polytechnic",
-            "ite",
-            "student",
-            "teacher",
-            "curriculum",
-            "moe",
-            "learning",
-            "skillsfuture",
-            "training",
-            "vocational",
-            "preschool",
-            "tuition",
-            "nus",
-            "ntu",
-            "smu",
-            "scholarship",
-        ],
-        "Health": [
-            "health",
-            "healthcare",
-            "hospital",
-            "medical",
-            "medicine",
-            "doctor",
-            "nurse",
-            "moh",
-            "clinic",
-            "patient",
-            "disease",
-            "treatment",
-            "medisave",
-            "medishield",
-            "medifund",
-            "elderly care",
-            "mental health",
-            "vaccine",
-            "pandemic",
-            "covid",
-        ],
-        "National Development": [
-            "housing",
-            "hdb",
-            "flat",
-            "home",
-            "property",
-            "bto",
-            "resale",
-            "mortgage",
-            "cpf housing",
-            "public housing",
-            "rental",
-            "estate",
-            "neighbourhood",
-            "urban",
-            "land use",
-            "planning",
-            "ura",
-            "development",
-        ],
-        "Transport": [
-            "transport",
-            "mrt",
-            "bus",
-            "train",
-            "lta",
-            "road",
-            "traffic",
-            "vehicle",
-            "car",
-            "taxi",
-            "cycling",
-            "infrastructure",
-            "airport",
-            "changi",
-            "port",
-            "ewl",
-            "nsl",
-            "nel",
-            "dtl",
-            "ccl",
-            "tel",
-        ],
-        "Trade Industry": [
-            "economy",
-            "economic",
-            "gdp",
-            "growth",
-            "recession",
-            "inflation",
-            "trade",
-            "export",
-            "import",
-            "investment",
-            "business",
-            "enterprise",
-            "sme",
-            "startup",
-            "industry",
-            "manufacturing",
-            "services",
-            "tourism",
-            "employment",
-            "jobs",
-            "unemployment",
-            "wages",
-            "productivity",
-            "competitiveness",
-            "mti",
-        ],
-        "Finance": [
-            "tax",
-            "gst",
-            "budget",
-            "fiscal",
-            "revenue",
-            "expenditure",
-            "deficit",
-            "surplus",
-            "reserves",
-            "mas",
-            "cpf",
-            "savings",
-            "pension",
-            "retirement",
-            "income tax",
-            "corporate tax",
-            "stamp duty",
-            "iras",
-        ],
-        "Social Family Development": [
-            "social",
-            "welfare",
-            "comcare",
-            "assistance",
-            "support",
-            "low-income",
-            "vulnerable",
-            "disability",
-            "family",
-            "children",
-            "youth",
-            "seniors",
-            "pioneer generation",
-            "merdeka generation",
-            "silver support",
-            "workfare",
-            "gst voucher",
-            "cdc voucher",
-            "msf",
-        ],
-        "Sustainability Environment": [
-            "environment",
-            "climate",
-            "sustainability",
-            "green",
-            "carbon",
-            "emissions",
-            "renewable",
-            "solar",
-            "energy",
-            "water",
-            "newater",
-            "recycling",
-            "waste",
-            "pollution",
-            "biodiversity",
-            "nature",
-            "parks",
-            "gardens",
-            "mse",
-        ],
-        "Communications Information": [
-            "technology",
-            "digital",
-            "innovation",
-            "research",
-            "r&d",
-            "ai",
-            "artificial intelligence",
-            "smart nation",
-            "cyber",
-            "data",
-            "fintech",
-            "biotech",
-            "infocomm",
-            "ict",
-            "automation",
-            "robotics",
-            "internet",
-            "mci",
-            "imda",
-        ],
-        "Manpower": [
-            "workforce",
-            "workers",
-            "foreign workers",
-            "levy",
-            "mom",
-            "labour",
-            "labor",
-            "skills",
-            "retraining",
-        ],
-        "Home Affairs": [
-            "police",
-            "spf",
-            "scdf",
-            "civil defence",
-            "fire",
-            "emergency",
-            "crime",
-            "law enforcement",
-            "mha",
-            "immigration",
-            "ica",
-            "prisons",
-        ],
-        "Foreign Affairs": [
-            "foreign",
-            "diplomacy",
-            "asean",
-            "international",
-            "bilateral",
-            "embassy",
-            "mfa",
-            "treaty",
-        ],
-        "Culture Community Youth": [
-            "culture",
-            "arts",
-            "heritage",
-            "sports",
-            "community",
-            "mccy",
-            "nac",
-            "museum",
-            "national day",
-        ],
-        "Law": [
-            "legal",
-            "courts",
-            "judiciary",
-            "minlaw",
-            "attorney",
-            "legislation",
-        ],
-    }
-
-    def classify_topic(text):
-        """Classify a sentence into a topic based on keywords"""
-        text_lower = text.lower()
-        topic_scores = {}
-
-        for topic, keywords in topic_keywords.items():
-            score = sum(1 for kw in keywords if kw in text_lower)
-            if score > 0:
-                topic_scores[topic] = score
-
-        if topic_scores:
-            return max(topic_scores, key=topic_scores.get)
-        return "General"
-
-    # Process each parquet file
-    parquet_files = sorted(parquet_dir.glob("*.parquet"))
-
-    for filepath in parquet_files:
-        year = int(filepath.stem)
-        df = pd.read_parquet(filepath)
-
-        minister = get_minister(year)
-        decade = f"{(year // 10) * 10}s"
-
-        for _, row in df.iterrows():
-            sentence = row["sentence_text"].strip()
-
-            # Skip very short fragments or placeholder text
-            if len(sentence) < 20:
-                continue
-            if "Please refer to Hansard document" in sentence:
-                continue
+    # Sentences with their stored ministry_topic classification (see topic_classifier.py)
+    df_all = load_classified_sentences(
+        parquet_dir, columns=["year", "sentence_order", "sentence_text"]
+    )
+    num_speeches = df_all["year"].nunique()
 
-            # Classify the sentence topic
-            topic = classify_topic(sentence)
+    # Skip very short fragments or placeholder text
+    text = df_all["sentence_text"].fillna("").str.strip()
+    keep = (text.str.len() >= 20) & ~text.str.contains(
+        "Please refer to Hansard document", regex=False
+    )
+    df_all = df_all[keep].sort_values("year", kind="stable")
+    text = text[df_all.index]
 
-            all_sentences.append(
-                {
-                    "year": year,
-                    "decade": decade,
-                    "minister": minister,
-                    "text": sentence,
-                    "idx": int(row["sentence_order"]),
-                    "topic": topic,
-                }
-            )
+    # Per-value lookups run once per year / topic, not per sentence
+    years = df_all["year"].astype(int)
+    all_sentences = pd.DataFrame(
+        {
+            "year": years,
+            "decade": (years // 10 * 10).astype(str) + "s",
+            "minister": years.map({year: get_minister(year) for year in years.unique()}),
+            "text": text,
+            "idx": df_all["sentence_order"].astype(int),
+            "topic": df_all["ministry_topic"].map(
+                {topic: topic_display_name(topic) for topic in df_all["ministry_topic"].unique()}
+            ),
+        }
+    )
 
-    print(f"  📝 Extracted {len(all_sentences):,} sentences from {len(parquet_files)} speeches")
+    print(f"  📝 Extracted {len(all_sentences):,} sentences from {num_speeches} speeches")
 
     # Create overview - aligned with ministries_overview.json
     overview = {
         "total_sentences": len(all_sentences),
-        "years": sorted(list(set(s["year"] for s in all_sentences))),
+        "years": sorted(all_sentences["year"].unique().tolist()),
         "decades": ["1960s", "1970s", "1980s", "1990s", "2000s", "2010s", "2020s"],
         "topics": [
             "General",
@@ -668,8 +428,10 @@ def export_search_index():
     print(f"  ✓ Exported overview.json ({output_path.stat().st_size / 1024:.1f} KB)")
 
     # Export by decade shards
-    for decade in ["1960s", "1970s", "1980s", "1990s", "2000s", "2010s", "2020s"]:
-        decade_sentences = [s for s in all_sentences if s["decade"] == decade]
+    decade_groups = dict(list(all_sentences.groupby("decade", sort=False)))
+    for decade in overview["decades"]:
+        group = decade_groups.get(decade, all_sentences.iloc[:0])
+        decade_sentences = group.to_dict("records")
 
         shard = {"decade": decade, "count": len(decade_sentences), "sentences": decade_sentences}
 
@@ -680,11 +442,123 @@ def export_search_index():
         size_kb = output_path.stat().st_size / 1024
         print(f"  ✓ Exported {decade}.json ({size_kb:.1f} KB, {len(decade_sentences):,} sentences)")
 
+    export_inverted_index(all_sentences.reset_index(drop=True))
+
     print(f"\n  ✅ Search index complete with {len(all_sentences):,} searchable sentences")
 
 
+def export_inverted_index(sentences: pd.DataFrame):
+    """
+    Export a prebuilt inverted index of the search sentences for BM25 ranking
+
+    Sentence ids are positions in decade shard order (so ids of a year are contiguous).
+    Writes to search-index/inverted/:
+    - index.json: BM25 parameters, year -> first id and minister, and one topic code
+      per sentence, so results can be filtered and sorted without their text
+    - terms/{prefix}.json: term -> {"df", "ids" (delta-encoded), "w"} for every term
+      starting with prefix, w being the term's BM25 weight in the sentence times
+      WEIGHT_SCALE (a query's score is the sum over its terms)
+    - sentences/{block}.json: sentence texts, TEXT_BLOCK_SIZE per file
+    """
+    if INVERTED_DIR.exists():
+        shutil.rmtree(INVERTED_DIR)
+    (INVERTED_DIR / "terms").mkdir(parents=True)
+    (INVERTED_DIR / "sentences").mkdir(parents=True)
+
+    # (term, sentence) -> term frequency, sorted by term then sentence id
+    tokens = sentences["text"].str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+    pairs = pd.DataFrame({"term": tokens.to_numpy(), "id": tokens.index.to_numpy()})
+    term_freq = pairs.groupby(["term", "id"]).size()
+    terms = term_freq.index.get_level_values("term")
+    ids = term_freq.index.get_level_values("id").to_numpy()
+    tf = term_freq.to_numpy()
+
+    # BM25 term weights: idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg_length))
+    num_sentences = len(sentences)
+    lengths = np.bincount(pairs["id"], minlength=num_sentences)
+    avg_length = lengths.mean()
+    doc_freq = pd.Series(terms).value_counts(sort=False)
+    idf = np.log(1 + (num_sentences - doc_freq + 0.5) / (doc_freq + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[ids] / avg_length)
+    weights = idf.reindex(terms).to_numpy() * tf * (BM25_K1 + 1) / (tf + norm)
+    weights = np.maximum(np.rint(weights * WEIGHT_SCALE), 1).astype(int)
+
+    # Delta-encode each term's (sorted) sentence ids
+    starts = np.flatnonzero(np.r_[True, terms[1:] != terms[:-1]])
+    deltas = np.diff(ids, prepend=0)
+    deltas[starts] = ids[starts]
+
+    bounds = np.r_[starts, len(ids)]
+    shards: dict[str, dict] = {}
+    for term, start, end in zip(terms[starts], bounds[:-1], bounds[1:]):
+        shards.setdefault(term[:TERM_PREFIX_LENGTH], {})[term] = {
+            "df": int(end - start),
+            "ids": deltas[start:end].tolist(),
+            "w": weights[start:end].tolist(),
+        }
+    for prefix, shard in shards.items():
+        with open(INVERTED_DIR / "terms" / f"{prefix}.json", "w") as f:
+            json.dump(shard, f, separators=(",", ":"))
+
+    texts = sentences["text"].tolist()
+    for block, start in enumerate(range(0, num_sentences, TEXT_BLOCK_SIZE)):
+        with open(INVERTED_DIR / "sentences" / f"{block}.json", "w") as f:
+            json.dump(texts[start : start + TEXT_BLOCK_SIZE], f)
+
+    years = sentences.drop_duplicates("year")
+    topics = sorted(sentences["topic"].unique())
+    topic_codes = sentences["topic"].map({topic: i for i, topic in enumerate(topics)})
+    index = {
+        "num_sentences": num_sentences,
+        "num_terms": len(starts),
+        "token_pattern": TOKEN_PATTERN,
+        "prefix_length": TERM_PREFIX_LENGTH,
+        "block_size": TEXT_BLOCK_SIZE,
+        "bm25": {
+            "k1": BM25_K1,
+            "b": BM25_B,
+            "avg_length": round(float(avg_length), 4),
+            "weight_scale": WEIGHT_SCALE,
+        },
+        "years": years["year"].tolist(),
+        "year_starts": years.index.tolist(),
+        "ministers": years["minister"].tolist(),
+        "topics": topics,
+        # One base-36 digit per sentence: its index in topics
+        "sentence_topics": "".join(np.base_repr(code, 36).lower() for code in topic_codes),
+    }
+    output_path = INVERTED_DIR / "index.json"
+    with open(output_path, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+
+    size_kb = sum(path.stat().st_size for path in INVERTED_DIR.rglob("*.json")) / 1024
+    print(
+        f"  ✓ Exported inverted index ({size_kb:.1f} KB, {len(starts):,} terms "
+        f"in {len(shards)} shards)"
+    )
+
+
+# Exports by name, in the order main runs them
+EXPORTS = {
+    "ministries": export_ministries_overview,
+    "ministers": export_ministers_overview,
+    "yearly": export_yearly_overview,
+    "linguistic_windows": export_linguistic_windows,
+    "search_index": export_search_index,
+}
+
+
 def main():
     """Main export pipeline"""
+    parser = argparse.ArgumentParser(description="Export CSV and parquet data to web JSON")
+    parser.add_argument(
+        "exports", nargs="*", help=f"Exports to run (default: all): {', '.join(EXPORTS)}"
+    )
+    args = parser.parse_args()
+    unknown = [name for name in args.exports if name not in EXPORTS]
+    if unknown:
+        parser.error(f"unknown export(s): {', '.join(unknown)}")
+
     print("=" * 60)
     print("🚀 EXPORTING DATA FOR WEB VISUALISATION")
     print("=" * 60)
@@ -694,10 +568,8 @@ def main():
         ensure_directories()
 
         # Export data
-        export_ministries_overview()
-        export_ministers_overview()
-        export_yearly_overview()
-        export_search_index()
+        for name in args.exports or EXPORTS:
+            EXPORTS[name]()
 
         print("\n" + "=" * 60)
         print("✅ EXPORT COMPLETE!")
@@ -5,360 +5,26 @@ This script analyzes Singapore budget speeches to discover common keywords
 for each ministry topic, helping to improve the classification keyword lists.
 """
 
+import argparse
 import re
-import sys
-from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List
-
-import pandas as pd
-
-# Add extractor to path
-sys.path.append(str(Path(__file__).parent.parent / "extractor"))
-
-# Improved ministry topics (with auto-discovered keywords)
-MINISTRY_TOPICS = {
-    "communications_information": {
-        "keywords": [
-            "5g",
-            "broadband",
-            "broadcasting",
-            "communications",
-            "cyber",
-            "digital",
-            "imda",
-            "infocomm",
-            "information",
-            "internet",
-            "media",
-            "technology",
-            "telecommunications",
-        ],
-        "label": "Communications & Information",
-    },
-    "culture_community_youth": {
-        "keywords": [
-            "arts",
-            "community",
-            "culture",
-            "day rally",
-            "heritage",
-            "library",
-            "mccy",
-            "museum",
-            "national day",
-            "national day rally",
-            "nlb",
-            "racial harmony",
-            "recreation",
-            "sport",
-            "sports",
-            "youth",
-        ],
-        "label": "Culture, Community & Youth",
-    },
-    "defence": {
-        "keywords": [
-            "air force",
-            "army",
-            "defence",
-            "defense",
-            "military",
-            "mindef",
-            "national service",
-            "navy",
-            "ns",
-            "rsaf",
-            "rsn",
-            "saf",
-            "safti",
-            "security",
-        ],
-        "label": "Defence",
-    },
-    "education": {
-        "keywords": [
-            "college",
-            "curriculum",
-            "despite",
-            "education",
-            "ite",
-            "items",
-            "learning",
-            "moe",
-            "ntu",
-            "nus",
-            "polytechnic",
-            "preschool",
-            "primary",
-            "school",
-            "schools",
-            "secondary",
-            "skillsfuture",
-            "smu",
-            "student",
-            "students",
-            "teacher",
-            "united",
-            "universities",
-            "university",
-        ],
-        "label": "Education",
-    },
-    "finance": {
-        "keywords": [
-            "budget",
-            "corporate",
-            "corporate tax",
-            "customs",
-            "debt",
-            "deficit",
-            "estimated",
-            "excise",
-            "fiscal",
-            "gst",
-            "income tax",
-            "iras",
-            "personal",
-            "personal income",
-            "property",
-            "property tax",
-            "revenue",
-            "stamp duty",
-            "surplus",
-            "tax",
-            "tax rate",
-            "tax rates",
-            "taxes",
-            "treasury",
-        ],
-        "label": "Finance",
-    },
-    "foreign_affairs": {
-        "keywords": [
-            "ambassador",
-            "asean",
-            "bilateral",
-            "diplomatic",
-            "embassy",
-            "foreign",
-            "international",
-            "mfa",
-            "overseas",
-            "relations",
-            "treaty",
-        ],
-        "label": "Foreign Affairs",
-    },
-    "health": {
-        "keywords": [
-            "careshield",
-            "clinic",
-            "disease",
-            "doctor",
-            "eldercare",
-            "eldershield",
-            "health",
-            "healthcare",
-            "hospital",
-            "hospitals",
-            "medical",
-            "medisave",
-            "medisave top",
-            "medishield",
-            "moh",
-            "nurse",
-            "patient",
-            "patients",
-            "polyclinic",
-        ],
-        "label": "Health",
-    },
-    "home_affairs": {
-        "keywords": [
-            "approves",
-            "april",
-            "citizen",
-            "civil defence",
-            "crime",
-            "emergency",
-            "financial policy",
-            "fire",
-            "home affairs",
-            "ica",
-            "immigration",
-            "law enforcement",
-            "police",
-            "pr",
-            "safety",
-            "scdf",
-        ],
-        "label": "Home Affairs",
-    },
-    "law": {
-        "keywords": [
-            "attorney general",
-            "court",
-            "judge",
-            "judiciary",
-            "justice",
-            "law",
-            "legal",
-            "legislation",
-            "minlaw",
-            "regulation",
-            "statute",
-        ],
-        "label": "Law",
-    },
-    "manpower": {
-        "keywords": [
-            "cpf",
-            "employers",
-            "employment",
-            "foreign workers",
-            "jobs",
-            "labor",
-            "labour",
-            "manpower",
-            "ntuc",
-            "progressive wage",
-            "retirement",
-            "salary",
-            "skilled",
-            "skills",
-            "training",
-            "unemployment",
-            "wage",
-            "wages",
-            "workers",
-            "workfare",
-            "workforce",
-        ],
-        "label": "Manpower",
-    },
-    "national_development": {
-        "keywords": [
-            "bca",
-            "bto",
-            "building",
-            "construction",
-            "estate",
-            "estate duty",
-            "flat",
-            "flats",
-            "hdb",
-            "hdb flats",
-            "housing",
-            "inflation",
-            "planning",
-            "property",
-            "public housing",
-            "resale",
-            "room",
-            "room hdb",
-            "town",
-            "ura",
-            "urban",
-        ],
-        "label": "National Development",
-    },
-    "social_family_development": {
-        "keywords": [
-            "aged",
-            "assistance",
-            "children",
-            "comcare",
-            "elderly",
-            "family",
-            "family development",
-            "low income",
-            "msf",
-            "social",
-            "social support",
-            "subsidy",
-            "vulnerable",
-            "welfare",
-        ],
-        "label": "Social & Family Development",
-    },
-    "sustainability_environment": {
-        "keywords": [
-            "carbon",
-            "climate",
-            "climate change",
-            "emission",
-            "emissions",
-            "energy",
-            "environment",
-            "green",
-            "nea",
-            "net zero",
-            "pollution",
-            "pub",
-            "recycling",
-            "renewable",
-            "sustainability",
-            "waste",
-            "water",
-        ],
-        "label": "Sustainability & Environment",
-    },
-    "trade_industry": {
-        "keywords": [
-            "assessment",
-            "business",
-            "businesses",
-            "commerce",
-            "edb",
-            "enterprise",
-            "enterprises",
-            "export",
-            "exports",
-            "fdi",
-            "import",
-            "important",
-            "industrial",
-            "industry",
-            "innovation",
-            "investment",
-            "investments",
-            "manufacturing",
-            "productivity",
-            "sme",
-            "smes",
-            "startup",
-            "trade",
-        ],
-        "label": "Trade & Industry",
-    },
-    "transport": {
-        "keywords": [
-            "bus",
-            "car",
-            "cars",
-            "changi airport",
-            "coe",
-            "erp",
-            "lrt",
-            "lta",
-            "maritime",
-            "mrt",
-            "opportunities",
-            "port",
-            "road",
-            "shipping",
-            "smrt",
-            "taxi",
-            "traffic",
-            "train",
-            "transport",
-        ],
-        "label": "Transport",
-    },
-}
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+from topic_classifier import (
+    MINISTRY_TOPICS,
+    KeywordClassifier,
+    keyword_weight,
+    load_classified_sentences,
+    prepare_corpus,
+    score_hits,
+)
 
-# Common stop words to exclude
 STOP_WORDS = {
     "the",
     "a",
@@ -483,115 +149,359 @@ STOP_WORDS = {
 }
 
 
-def classify_sentence(text: str) -> tuple:
-    """Classify a sentence using existing keywords."""
-    text_lower = text.lower()
-    scores = {}
-
-    for ministry, info in MINISTRY_TOPICS.items():
-        score = 0
-        for keyword in info["keywords"]:
-            if keyword in text_lower:
-                word_count = len(keyword.split())
-                weight = word_count if word_count > 1 else 1
-                score += weight
-        scores[ministry] = score
-
-    max_score = max(scores.values())
-    if max_score == 0:
-        return "general", 0
-
-    best_ministry = max(scores, key=lambda k: scores[k])
-    return best_ministry, max_score
+class IncrementalClassification:
+    """
+    Classification of a fixed corpus that can absorb new keywords without a full rerun.
 
+    Keeps the sentence x keyword hit matrix, whose columns are the posting lists of
+    each keyword. Adding keywords scans the corpus only for the new keywords and
+    rescores only the sentences in their postings; every other score is unchanged.
+    """
 
-def extract_ngrams(text: str, n: int) -> List[str]:
-    """Extract n-grams from text."""
+    def __init__(self, texts: Iterable[str], topics: Dict[str, Dict] = MINISTRY_TOPICS):
+        self.topics = {
+            m: {**info, "keywords": list(info["keywords"])} for m, info in topics.items()
+        }
+        self._corpus, self._offsets = prepare_corpus(texts)
+
+        classifier = KeywordClassifier(self.topics)
+        self.ministries = classifier.ministries
+        self.keyword_ids = dict(classifier.keyword_ids)
+        self.weights = classifier.weights
+        self.hits = classifier.match(self._corpus, self._offsets)
+        self.labels, self.confidence = classifier.score(self.hits)
+
+    def coverage(self) -> float:
+        """Share of sentences assigned to a ministry (not 'general')."""
+        return float(np.mean(self.labels != "general"))
+
+    def occurring(self, candidates: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """
+        Keep each ministry's candidate keywords that occur in its own sentences.
+
+        Candidates are built from stopword-free tokens ("science technology"), while the
+        classifier matches keywords as substrings of the raw text, so some can never hit.
+        """
+        keywords = sorted({kw for kws in candidates.values() for kw in kws})
+        if not keywords:
+            return {}
+        matcher = KeywordClassifier({"candidates": {"keywords": keywords}})
+        hits = matcher.match(self._corpus, self._offsets)
+
+        kept = {}
+        for ministry, kws in candidates.items():
+            found = np.asarray(hits[self.labels == ministry].sum(axis=0)).ravel() > 0
+            terms = [kw for kw in kws if found[matcher.keyword_ids[kw]]]
+            if terms:
+                kept[ministry] = terms
+        return kept
+
+    def add_keywords(self, additions: Dict[str, List[str]]) -> np.ndarray:
+        """
+        Add keywords to ministries and rescore the sentences that contain them.
+
+        Returns the ids of the rescored sentences.
+        """
+        new_keywords = {kw for kws in additions.values() for kw in kws} - set(self.keyword_ids)
+        if new_keywords:
+            matcher = KeywordClassifier({"new": {"keywords": sorted(new_keywords)}})
+            first_id = len(self.keyword_ids)
+            for i, kw in enumerate(matcher.keywords):
+                self.keyword_ids[kw] = first_id + i
+            self.hits = sparse.hstack(
+                [self.hits, matcher.match(self._corpus, self._offsets)], format="csr"
+            )
+            self.weights = np.vstack(
+                [self.weights, np.zeros((len(matcher.keywords), len(self.ministries)), np.int64)]
+            )
+
+        touched = []
+        for ministry, keywords in additions.items():
+            column = self.ministries.index(ministry)
+            for kw in keywords:
+                if kw in self.topics[ministry]["keywords"]:
+                    continue
+                self.topics[ministry]["keywords"].append(kw)
+                self.weights[self.keyword_ids[kw], column] += keyword_weight(kw)
+                touched.append(self.keyword_ids[kw])
+
+        rows = np.unique(self.hits[:, touched].tocoo().row)
+        if len(rows):
+            labels, confidence = score_hits(self.hits[rows], self.weights, self.ministries)
+            self.labels[rows] = labels
+            self.confidence[rows] = confidence
+        return rows
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of 3+ letters with stop words removed."""
     words = re.findall(r"\b[a-z]{3,}\b", text.lower())
-    words = [w for w in words if w not in STOP_WORDS]
+    return [w for w in words if w not in STOP_WORDS]
+
 
+def ngrams_from_tokens(words: List[str], n: int) -> List[str]:
+    """Join each run of n consecutive tokens into a space-separated n-gram."""
     if n == 1:
         return words
+    return [" ".join(words[i : i + n]) for i in range(len(words) - n + 1)]
 
-    ngrams = []
-    for i in range(len(words) - n + 1):
-        ngram = " ".join(words[i : i + n])
-        ngrams.append(ngram)
-    return ngrams
 
+def extract_terms(text: str, n_values: Tuple[int, ...] = (1, 2, 3)) -> List[str]:
+    """Extract all n-gram terms of the given sizes from text, tokenizing it once."""
+    words = tokenize(text)
+    terms = []
+    for n in n_values:
+        terms.extend(ngrams_from_tokens(words, n))
+    return terms
 
-def analyze_ministry_keywords(df: pd.DataFrame, ministry: str, top_n: int = 30) -> Dict[str, int]:
-    """Analyze a ministry's classified sentences to find common keywords."""
-    ministry_sentences = df[df["ministry_topic"] == ministry]["sentence_text"]
 
-    # Extract 1-grams, 2-grams, and 3-grams
-    all_terms = []
-    for text in ministry_sentences:
-        all_terms.extend(extract_ngrams(text, 1))
-        all_terms.extend(extract_ngrams(text, 2))
-        all_terms.extend(extract_ngrams(text, 3))
+def count_terms(
+    texts: List[str], n_values: Tuple[int, ...] = (1, 2, 3)
+) -> Tuple[np.ndarray, sparse.csr_matrix]:
+    """Count terms in a chunk of sentences, returning (sorted terms, sentence x term counts)."""
+    # CountVectorizer rejects an empty vocabulary (e.g. a chunk of only stop words);
+    # an empty (len(texts), 0) block still lines up in merge_term_counts
+    if not any(extract_terms(text, n_values) for text in texts):
+        return np.array([], dtype=object), sparse.csr_matrix((len(texts), 0), dtype=np.int64)
 
-    # Count occurrences
-    term_counts = Counter(all_terms)
+    vectorizer = CountVectorizer(analyzer=partial(extract_terms, n_values=n_values))
+    counts = vectorizer.fit_transform(texts).tocsr()
+    return vectorizer.get_feature_names_out(), counts
 
-    # Remove existing keywords from consideration
-    existing_keywords = set(MINISTRY_TOPICS[ministry]["keywords"])
-    for kw in existing_keywords:
-        term_counts.pop(kw, None)
 
-    return dict(term_counts.most_common(top_n))
+def merge_term_counts(
+    chunks: List[Tuple[np.ndarray, sparse.csr_matrix]]
+) -> Tuple[np.ndarray, sparse.csr_matrix]:
+    """
+    Stack per-chunk count matrices onto one shared sorted vocabulary.
 
+    Each chunk's columns are remapped into the union vocabulary by binary search, so
+    the result is identical to counting all sentences at once.
+    """
+    terms = np.unique(np.concatenate([chunk_terms for chunk_terms, _ in chunks]))
+    blocks = []
+    for chunk_terms, counts in chunks:
+        columns = np.searchsorted(terms, chunk_terms)
+        blocks.append(
+            sparse.csr_matrix(
+                (counts.data, columns[counts.indices], counts.indptr),
+                shape=(counts.shape[0], len(terms)),
+            )
+        )
+    return terms, sparse.vstack(blocks, format="csr")
 
-def calculate_specificity(df: pd.DataFrame, term: str, ministry: str) -> float:
+
+class DocumentTermMatrix:
     """
-    Calculate how specific a term is to a ministry.
-    Returns a score between 0 and 1, where higher means more specific.
+    Sparse sentence x term count matrix over a vocabulary built once for the corpus.
+
+    Rows follow the order of the texts passed in, columns are the sorted n-gram terms.
+    Per-ministry statistics become masked column sums over this matrix. Sentences are
+    counted in chunks across a process pool and merged onto a shared vocabulary; pass
+    workers=1 to count serially in-process.
+    """
+
+    def __init__(
+        self,
+        texts: Iterable[str],
+        n_values: Tuple[int, ...] = (1, 2, 3),
+        workers: Optional[int] = None,
+        chunk_size: int = 5000,
+    ):
+        texts = list(texts)
+        chunks = [texts[i : i + chunk_size] for i in range(0, len(texts), chunk_size)]
+
+        if workers == 1 or len(chunks) <= 1:
+            self.terms, self.counts = count_terms(texts, n_values)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # map() yields in submission order, keeping rows in sentence order
+                results = list(executor.map(count_terms, chunks, repeat(n_values)))
+            self.terms, self.counts = merge_term_counts(results)
+        self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+
+        # Binary presence (one per sentence)
+        self.presence = self.counts.copy()
+        self.presence.data[:] = 1
+        self.document_frequency = np.asarray(self.presence.sum(axis=0)).ravel()
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.vocabulary
+
+    def term_counts(self, mask: np.ndarray) -> np.ndarray:
+        """Total occurrences of every term across the masked sentences."""
+        return np.asarray(self.counts[mask].sum(axis=0)).ravel()
+
+    def specificity(self, mask: np.ndarray) -> np.ndarray:
+        """Share of each term's sentences that fall inside the mask (0 for unseen terms)."""
+        in_mask = np.asarray(self.presence[mask].sum(axis=0)).ravel()
+        return np.divide(
+            in_mask,
+            self.document_frequency,
+            out=np.zeros(len(self.terms)),
+            where=self.document_frequency > 0,
+        )
+
+
+def analyze_ministry_keywords(
+    dtm: DocumentTermMatrix,
+    labels: np.ndarray,
+    ministry: str,
+    top_n: int = 30,
+    existing_keywords: Optional[Iterable[str]] = None,
+) -> Dict[str, int]:
+    """Analyze a ministry's classified sentences to find common keywords."""
+    # 1-gram, 2-gram and 3-gram counts over this ministry's sentences
+    term_counts = dtm.term_counts(labels == ministry)
+
+    # Remove existing keywords from consideration
+    if existing_keywords is None:
+        existing_keywords = MINISTRY_TOPICS[ministry]["keywords"]
+    for kw in set(existing_keywords):
+        if kw in dtm.vocabulary:
+            term_counts[dtm.vocabulary[kw]] = 0
+
+    # Most common first; ties keep vocabulary (alphabetical) order
+    top = np.argsort(-term_counts, kind="stable")[:top_n]
+    return {str(dtm.terms[i]): int(term_counts[i]) for i in top if term_counts[i] > 0}
+
+
+def suggest_keywords(
+    dtm: DocumentTermMatrix,
+    labels: np.ndarray,
+    ministry: str,
+    existing_keywords: Optional[Iterable[str]] = None,
+    min_specificity: float = 0.4,
+    min_count: int = 8,
+    max_suggestions: int = 20,
+) -> List[Tuple[str, int, float]]:
+    """Return (term, count, specificity) candidates for a ministry, most specific first."""
+    # Find common terms
+    common_terms = analyze_ministry_keywords(
+        dtm, labels, ministry, top_n=50, existing_keywords=existing_keywords
+    )
+    specificities = dtm.specificity(labels == ministry)
+
+    # Filter by specificity (lowered threshold for political analysis)
+    candidates = []
+    for term, count in common_terms.items():
+        specificity = specificities[dtm.vocabulary[term]]
+        if specificity >= min_specificity and count >= min_count:
+            candidates.append((term, count, specificity))
+
+    # Sort by specificity
+    candidates.sort(key=lambda x: x[2], reverse=True)
+    return candidates[:max_suggestions]
+
+
+def refine_keywords(
+    state: IncrementalClassification,
+    dtm: DocumentTermMatrix,
+    max_iterations: int = 10,
+    tolerance: float = 0.001,
+) -> List[Dict[str, float]]:
     """
-    # Count occurrences in this ministry
-    ministry_sentences = df[df["ministry_topic"] == ministry]["sentence_text"]
-    ministry_count = sum(1 for text in ministry_sentences if term in text.lower())
+    Repeatedly add suggested keywords until the classification converges.
 
-    # Count occurrences in all sentences
-    total_count = sum(1 for text in df["sentence_text"] if term in text.lower())
+    Only suggestions that occur in the ministry's sentences are adopted. Stops when no
+    ministry has such suggestions or fewer than `tolerance` of the sentences change
+    ministry in an iteration. Returns per-iteration statistics.
+    """
+    history = []
+    for iteration in range(1, max_iterations + 1):
+        candidates = {}
+        for ministry in state.ministries:
+            suggestions = suggest_keywords(
+                dtm, state.labels, ministry, state.topics[ministry]["keywords"]
+            )
+            if suggestions:
+                candidates[ministry] = [term for term, _, _ in suggestions]
+        additions = state.occurring(candidates)
+
+        if not additions:
+            print(f"  Iteration {iteration}: no new keywords, converged")
+            break
+
+        previous = state.labels.copy()
+        rescored = state.add_keywords(additions)
+        changed = int(np.count_nonzero(state.labels != previous))
+
+        stats = {
+            "iteration": iteration,
+            "keywords_added": sum(len(terms) for terms in additions.values()),
+            "sentences_rescored": len(rescored),
+            "sentences_changed": changed,
+            "coverage": state.coverage(),
+        }
+        history.append(stats)
+        print(
+            f"  Iteration {iteration}: +{stats['keywords_added']} keywords, "
+            f"{len(rescored):,} rescored, {changed:,} changed, "
+            f"coverage {stats['coverage']:.1%}"
+        )
 
-    if total_count == 0:
-        return 0
+        if changed / len(state.labels) < tolerance:
+            print(f"  Converged after {iteration} iterations")
+            break
 
-    # Calculate specificity (what % of occurrences are in this ministry)
-    specificity = ministry_count / total_count
-    return specificity
+    return history
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Discover keywords for ministry topics")
+    parser.add_argument(
+        "--iterate",
+        action="store_true",
+        help="Apply suggestions and reclassify until the classification converges",
+    )
+    parser.add_argument(
+        "--max-iterations",
+        type=int,
+        default=10,
+        help="Maximum refinement iterations with --iterate (default: 10)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for n-gram counting (default: CPU count, 1 = serial)",
+    )
+    args = parser.parse_args()
+
     print("=" * 80)
     print("MINISTRY TOPIC KEYWORD DISCOVERY")
     print("=" * 80)
     print()
 
     # Load data
-    print("Loading speech data...")
-    output_processor_path = Path(__file__).parent.parent / "output_processor"
-    parquet_files = sorted(output_processor_path.glob("*.parquet"))
-
-    dfs = []
-    for file in parquet_files:
-        df = pd.read_parquet(file)
-        dfs.append(df)
-
-    df_all = pd.concat(dfs, ignore_index=True)
-    print(f"✓ Loaded {len(df_all):,} sentences from {len(parquet_files)} files\n")
-
-    # Initial classification
-    print("Performing initial classification with existing keywords...")
-    classification_results = df_all["sentence_text"].apply(classify_sentence)
-    df_all["ministry_topic"] = classification_results.apply(lambda x: x[0])
-    df_all["topic_confidence"] = classification_results.apply(lambda x: x[1])
+    print("Loading classified speech data...")
+    df_all = load_classified_sentences()
+    print(f"✓ Loaded {len(df_all):,} sentences from {df_all['year'].nunique()} speeches\n")
 
     classified_count = (df_all["ministry_topic"] != "general").sum()
     print(
         f"✓ Classified {classified_count:,} sentences ({classified_count/len(df_all)*100:.1f}%)\n"
     )
 
+    print("Building document-term matrix...")
+    dtm = DocumentTermMatrix(df_all["sentence_text"], workers=args.workers)
+    labels = df_all["ministry_topic"].to_numpy()
+    print(f"✓ {dtm.counts.shape[0]:,} sentences x {dtm.counts.shape[1]:,} terms\n")
+
+    if args.iterate:
+        print("=" * 80)
+        print("ITERATIVE KEYWORD REFINEMENT")
+        print("=" * 80)
+        print()
+
+        state = IncrementalClassification(df_all["sentence_text"], MINISTRY_TOPICS)
+        print(f"  Iteration 0: coverage {state.coverage():.1%}")
+        refine_keywords(state, dtm, max_iterations=args.max_iterations)
+        topics = state.topics
+        labels = state.labels
+    else:
+        topics = MINISTRY_TOPICS
+
     # Analyze each ministry
     print("=" * 80)
     print("DISCOVERING NEW KEYWORDS FOR EACH MINISTRY")
@@ -601,43 +511,32 @@ def main():
     improved_keywords = {}
 
     for ministry in sorted(MINISTRY_TOPICS.keys()):
-        ministry_data = df_all[df_all["ministry_topic"] == ministry]
-        if len(ministry_data) == 0:
+        classified = int(np.count_nonzero(labels == ministry))
+        if classified == 0:
             continue
 
         label = MINISTRY_TOPICS[ministry]["label"]
         print(f"\n{label} ({ministry})")
         print("-" * 80)
-        print(f"Current keywords: {len(MINISTRY_TOPICS[ministry]['keywords'])}")
-        print(f"Classified sentences: {len(ministry_data):,}")
+        print(f"Current keywords: {len(topics[ministry]['keywords'])}")
+        print(f"Classified sentences: {classified:,}")
 
-        # Find common terms
-        common_terms = analyze_ministry_keywords(df_all, ministry, top_n=50)
-
-        # Filter by specificity (lowered threshold for political analysis)
         print("\nTop candidate keywords (with specificity > 40%):")
-        candidates = []
-        for term, count in list(common_terms.items())[:50]:
-            specificity = calculate_specificity(df_all, term, ministry)
-            if specificity >= 0.4 and count >= 8:  # At least 40% specific and appears 8+ times
-                candidates.append((term, count, specificity))
-
-        # Sort by specificity
-        candidates.sort(key=lambda x: x[2], reverse=True)
+        candidates = suggest_keywords(dtm, labels, ministry, topics[ministry]["keywords"])
 
         suggested_keywords = []
-        for i, (term, count, spec) in enumerate(candidates[:20], 1):  # Show top 20
+        for i, (term, count, spec) in enumerate(candidates, 1):
             print(f"  {i:2d}. '{term}' (count: {count:4d}, specificity: {spec:.1%})")
             suggested_keywords.append(term)
 
-        # Store improved keyword list
+        # Store improved keyword list (iterative additions count as suggestions too)
+        original = MINISTRY_TOPICS[ministry]["keywords"]
+        combined = sorted(set(topics[ministry]["keywords"] + suggested_keywords))
         improved_keywords[ministry] = {
             "label": label,
-            "original_keywords": MINISTRY_TOPICS[ministry]["keywords"],
-            "suggested_additions": suggested_keywords,
-            "combined_keywords": sorted(
-                set(MINISTRY_TOPICS[ministry]["keywords"] + suggested_keywords)
-            ),
+            "original_keywords": original,
+            "suggested_additions": [kw for kw in combined if kw not in set(original)],
+            "combined_keywords": combined,
         }
 
     # Generate improved MINISTRY_TOPICS dictionary
@@ -693,8 +592,8 @@ def main():
     print("Next steps:")
     print("  1. Review improved_ministry_keywords.py")
     print("  2. Manually review suggested keywords for relevance")
-    print("  3. Update ministry_topic_analysis.ipynb with improved keywords")
-    print("  4. Re-run classification to see improvement")
+    print("  3. Update MINISTRY_TOPICS in topic_classifier.py with improved keywords")
+    print("  4. Re-run topic_classifier.py to see improvement")
     print("=" * 80)
 
 
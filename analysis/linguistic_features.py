@@ -3,28 +3,57 @@
 Linguistic Feature Analysis for Singapore Budget Speeches
 
 Extracts advanced NLP metrics:
-1. Vocabulary Richness (Type-Token Ratio, MTLD)
+1. Vocabulary Richness (Type-Token Ratio, MTLD, HD-D, MATTR), per speech and per section
 2. Temporal Orientation (Forward vs Backward looking)
 3. Certainty Index (Hedging vs Confident language)
 4. Passive Voice Ratio
+
+Marker and passive voice counts can also be stored per sentence as parquet columns
+(see annotate_parquet_files), so any grouping is a cheap aggregate_sentence_features.
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
 import re
+import string
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import repeat
 from pathlib import Path
+from typing import Iterable, Iterator
 
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import spacy
-from lexicalrichness import LexicalRichness
+from topic_classifier import trie_pattern
+
+# Add processor to path
+sys.path.append(str(Path(__file__).parent.parent / "processor"))
+
+from writer import read_parquet_metadata, update_parquet_columns  # noqa: E402
 
 # Paths
 ANALYSIS_DIR = Path(__file__).parent
 PROCESSOR_DIR = ANALYSIS_DIR.parent / "output_processor"
 
-# Load spaCy model
-print("Loading spaCy model...")
-nlp = spacy.load("en_core_web_sm")
+PASSIVE_SENTENCES_DIR = ANALYSIS_DIR / "passive_voice"
+CACHE_DIR = ANALYSIS_DIR / ".linguistic_cache"
+
+# Passive voice only needs dependencies and coarse POS tags (tagger + attribute_ruler)
+SPACY_EXCLUDE = ["ner", "lemmatizer"]
+
+
+@lru_cache(maxsize=1)
+def get_nlp() -> spacy.language.Language:
+    """Load the spaCy model once, on first use."""
+    print("Loading spaCy model...")
+    return spacy.load("en_core_web_sm", exclude=SPACY_EXCLUDE)
+
 
 # ============================================
 # WORD LISTS FOR LINGUISTIC ANALYSIS
@@ -147,46 +176,270 @@ CERTAINTY_MARKERS = [
 ]
 
 
-def count_pattern_matches(text: str, patterns: list[str]) -> int:
-    """Count total matches for a list of regex patterns."""
-    text_lower = text.lower()
-    total = 0
-    for pattern in patterns:
-        total += len(re.findall(pattern, text_lower))
-    return total
+MARKER_CATEGORIES = {
+    "forward": FORWARD_MARKERS,
+    "backward": BACKWARD_MARKERS,
+    "hedge": HEDGE_MARKERS,
+    "certainty": CERTAINTY_MARKERS,
+}
 
 
-def calculate_vocabulary_richness(text: str) -> dict:
+def marker_text(pattern: str) -> str:
+    """The literal phrase matched by a word-bounded marker pattern, e.g. "expect to"."""
+    return pattern.replace(r"\b", "")
+
+
+def overlapping_markers(markers: list[str]) -> list[tuple[str, str]]:
     """
-    Calculate vocabulary richness metrics using lexicalrichness library.
+    Pairs of markers that can match overlapping text without one containing the other.
 
-    Returns:
-        - ttr: Type-Token Ratio (unique words / total words)
-        - mtld: Measure of Textual Lexical Diversity (more robust for varying lengths)
+    ("will be", "be able") overlap on "be": a single left-to-right scan matches only one
+    of them in "will be able", where one findall per pattern counts both.
+    """
+    bounded = {marker: re.compile(r"\b" + re.escape(marker) + r"\b") for marker in markers}
+    pairs = []
+    for first in markers:
+        for second in markers:
+            for start in range(1, len(first)):
+                shared = first[start:]
+                if len(shared) >= len(second) or not second.startswith(shared):
+                    continue
+                text = first[:start] + second
+                if bounded[first].match(text) and bounded[second].match(text, start):
+                    pairs.append((first, second))
+                    break
+    return pairs
+
+
+class MarkerMatcher:
+    """
+    All marker lists compiled into one regex alternation, scanned once per text.
+
+    The alternation is factored as a character trie and prefers the longest marker at each
+    position. The matched phrase indexes a vector of per-category counts: a marker listed
+    in several categories ("will") counts in each, and a longer marker also counts the
+    shorter markers inside it ("expect to" is forward and contains the hedge marker
+    "expect"), so the totals equal one findall per pattern. Markers that overlap without
+    one containing the other cannot be counted this way and raise ValueError.
+    """
+
+    def __init__(self, categories: dict[str, list[str]] = MARKER_CATEGORIES):
+        self.categories = list(categories)
+        self.columns = [f"{category}_count" for category in self.categories]
+
+        patterns = list(dict.fromkeys(p for markers in categories.values() for p in markers))
+        self.markers = [marker_text(p) for p in patterns]
+        self.marker_ids = {marker: i for i, marker in enumerate(self.markers)}
+
+        overlaps = overlapping_markers(self.markers)
+        if overlaps:
+            listed = ", ".join(f'"{first}" / "{second}"' for first, second in overlaps)
+            raise ValueError(f"Marker lists contain overlapping markers: {listed}")
+
+        # marker x category: how often each category's patterns match inside the marker
+        self.vectors = np.array(
+            [
+                [sum(len(re.findall(p, marker)) for p in categories[c]) for c in self.categories]
+                for marker in self.markers
+            ],
+            dtype=np.int64,
+        )
+        self.pattern = re.compile(r"\b(?:" + trie_pattern(self.markers) + r")\b")
+
+    def count_by_sentence(self, sentences: Iterable[str]) -> pd.DataFrame:
+        """Per-sentence marker counts, one row per sentence and one column per category."""
+        sentences = list(sentences)
+        # Newlines never occur inside a marker, so matches cannot span sentences
+        corpus = "\n".join(sentences).lower()
+        offsets = np.cumsum([0] + [len(sentence) + 1 for sentence in sentences])
+
+        positions = []
+        marker_ids = []
+        for match in self.pattern.finditer(corpus):
+            positions.append(match.start())
+            marker_ids.append(self.marker_ids[match.group()])
+
+        rows = np.searchsorted(offsets, positions, side="right") - 1
+        counts = np.zeros((len(sentences), len(self.categories)), dtype=np.int64)
+        np.add.at(counts, rows, self.vectors[marker_ids])
+        return pd.DataFrame(counts, columns=self.columns)
+
+    def count(self, text: str) -> dict:
+        """Total marker counts per category for a whole text."""
+        totals = self.count_by_sentence([text]).iloc[0]
+        return {column: int(totals[column]) for column in self.columns}
+
+
+MARKER_MATCHER = MarkerMatcher()
+
+
+# Word tokens as counted by lexicalrichness: lowercase, digits and dashes dropped,
+# split on whitespace and punctuation
+DROPPED_CHARS = re.compile(r"[0-9\-–—]+")
+WORD_TOKEN = re.compile(r"[^\s" + re.escape(string.punctuation) + r"]+")
+
+MTLD_THRESHOLD = 0.72
+HDD_DRAWS = 42
+MATTR_WINDOW = 100
+
+# Sliding windows along a speech, in sentences
+WINDOW_SIZE = 50
+WINDOW_STEP = 25
+
+
+def tokenize_words(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return WORD_TOKEN.findall(DROPPED_CHARS.sub("", text.lower()))
+
+
+def encode_sentences(sentences: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Tokenize sentences once into a stream of integer word ids.
+
+    Returns the ids of the whole text and the number of tokens in each sentence.
+    """
+    vocabulary: dict[str, int] = {}
+    ids: list[int] = []
+    lengths = []
+    for sentence in sentences:
+        words = tokenize_words(sentence)
+        ids.extend(vocabulary.setdefault(word, len(vocabulary)) for word in words)
+        lengths.append(len(words))
+    return np.array(ids, dtype=np.int64), np.array(lengths, dtype=np.int64)
+
+
+def mtld_pass(ids: Iterable[int], words: int, types: int, threshold: float) -> float:
+    """One directional MTLD pass: mean length of segments that keep TTR above threshold."""
+    terms: set[int] = set()
+    word_counter = 0
+    factor_count = 0.0
+    ttr = 1.0
+
+    for word in ids:
+        word_counter += 1
+        terms.add(word)
+        ttr = len(terms) / word_counter
+
+        if ttr <= threshold:
+            word_counter = 0
+            terms = set()
+            factor_count += 1
+
+    # Partial factor for the last segment: how far its TTR fell towards the threshold
+    if word_counter > 0:
+        factor_count += (1 - ttr) / (1 - threshold)
+
+    # TTR never dropped to the threshold
+    if factor_count == 0:
+        ttr = types / words
+        factor_count += 1 if ttr == 1 else (1 - ttr) / (1 - threshold)
+
+    return words / factor_count
+
+
+def mtld(ids: np.ndarray, threshold: float = MTLD_THRESHOLD) -> float:
+    """Measure of Textual Lexical Diversity, averaged over a forward and a backward pass."""
+    words = len(ids)
+    types = len(np.unique(ids))
+    sequence = ids.tolist()
+    forward = mtld_pass(sequence, words, types, threshold)
+    backward = mtld_pass(reversed(sequence), words, types, threshold)
+    return (forward + backward) / 2
+
+
+def hdd(ids: np.ndarray, draws: int = HDD_DRAWS) -> float:
+    """
+    Hypergeometric distribution diversity: expected TTR of a random draw of `draws` tokens.
+
+    Each type contributes P(it appears at least once in the draw) / draws, where
+    P(absent) = C(N - f, draws) / C(N, draws) for a type with frequency f.
+    """
+    words = len(ids)
+    frequencies = np.bincount(ids)
+    frequencies = frequencies[frequencies > 0]
+    steps = np.arange(draws)
+    # Product form of the ratio of binomials; a zero factor means the type cannot be missed
+    absent = np.prod(
+        np.clip(words - frequencies[:, None] - steps, 0, None) / (words - steps), axis=1
+    )
+    return float(np.sum(1 - absent) / draws)
+
+
+def mattr(ids: np.ndarray, window: int = MATTR_WINDOW) -> float:
+    """
+    Moving-average TTR over every window of `window` consecutive tokens.
+
+    A token is new to window [s, s + window) when its previous occurrence lies before s,
+    so each token adds one distinct type to a contiguous range of window starts; the
+    distinct counts of all windows come from one cumulative sum.
     """
-    try:
-        lex = LexicalRichness(text)
-        return {
-            "ttr": round(lex.ttr, 4) if lex.words > 0 else 0,
-            "mtld": round(lex.mtld(threshold=0.72), 2) if lex.words > 50 else None,
-            "unique_words": lex.wordlist.__len__() if hasattr(lex, "wordlist") else 0,
-            "total_words": lex.words,
-        }
-    except Exception:
-        return {"ttr": 0, "mtld": None, "unique_words": 0, "total_words": 0}
+    words = len(ids)
+    windows = words - window + 1
+
+    # Position of each token's previous occurrence (-1 for the first)
+    order = np.lexsort((np.arange(words), ids))
+    previous = np.full(words, -1, dtype=np.int64)
+    same = ids[order[1:]] == ids[order[:-1]]
+    previous[order[1:][same]] = order[:-1][same]
+
+    positions = np.arange(words)
+    first = np.maximum(previous + 1, positions - window + 1)
+    last = np.minimum(positions, windows - 1)
+    valid = first <= last
+
+    delta = np.zeros(windows + 1, dtype=np.int64)
+    np.add.at(delta, first[valid], 1)
+    np.add.at(delta, last[valid] + 1, -1)
+    distinct = np.cumsum(delta[:-1])
+    return float(distinct.mean() / window)
+
+
+def richness(ids: np.ndarray) -> dict:
+    """TTR, MTLD, HD-D and MATTR of a token id stream (None when the text is too short)."""
+    words = len(ids)
+    types = len(np.unique(ids))
+    return {
+        "ttr": round(types / words, 4) if words > 0 else 0,
+        "mtld": round(mtld(ids), 2) if words > 50 else None,
+        "hdd": round(hdd(ids), 4) if words >= HDD_DRAWS else None,
+        "mattr": round(mattr(ids), 4) if words >= MATTR_WINDOW else None,
+        "unique_words": types,
+        "total_words": words,
+    }
 
 
-def calculate_temporal_orientation(text: str) -> dict:
+def section_richness(df: pd.DataFrame, ids: np.ndarray, lengths: np.ndarray) -> list[dict]:
+    """Richness of each section of a speech, in speech order."""
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    sections = []
+    for section_order, (title, group) in enumerate(
+        df.groupby("section_title", sort=False, dropna=False)
+    ):
+        rows = group.index.to_numpy()
+        section_ids = np.concatenate([ids[bounds[i] : bounds[i + 1]] for i in rows])
+        metrics = richness(section_ids)
+        sections.append(
+            {
+                "section_order": section_order,
+                "section_title": title if isinstance(title, str) else None,
+                "total_sentences": len(rows),
+                **metrics,
+            }
+        )
+    return sections
+
+
+def calculate_temporal_orientation(markers: dict) -> dict:
     """
-    Calculate forward vs backward looking language ratio.
+    Calculate forward vs backward looking language ratio from marker counts.
 
     Returns:
         - forward_count: Number of forward-looking markers
         - backward_count: Number of backward-looking markers
         - temporal_ratio: forward / (forward + backward), higher = more forward-looking
     """
-    forward = count_pattern_matches(text, FORWARD_MARKERS)
-    backward = count_pattern_matches(text, BACKWARD_MARKERS)
+    forward = markers["forward_count"]
+    backward = markers["backward_count"]
     total = forward + backward
 
     return {
@@ -196,17 +449,17 @@ def calculate_temporal_orientation(text: str) -> dict:
     }
 
 
-def calculate_certainty_index(text: str) -> dict:
+def calculate_certainty_index(markers: dict) -> dict:
     """
-    Calculate certainty vs hedging language ratio.
+    Calculate certainty vs hedging language ratio from marker counts.
 
     Returns:
         - hedge_count: Number of hedging markers
         - certainty_count: Number of certainty markers
         - certainty_ratio: certainty / (certainty + hedge), higher = more confident
     """
-    hedge = count_pattern_matches(text, HEDGE_MARKERS)
-    certainty = count_pattern_matches(text, CERTAINTY_MARKERS)
+    hedge = markers["hedge_count"]
+    certainty = markers["certainty_count"]
     total = hedge + certainty
 
     return {
@@ -216,102 +469,494 @@ def calculate_certainty_index(text: str) -> dict:
     }
 
 
-def calculate_passive_voice_ratio(text: str) -> dict:
+def passive_voice_counts(
+    sentences: Iterable[str], batch_size: int = 256
+) -> Iterator[tuple[int, int]]:
+    """
+    Yield (passive_count, active_count) per sentence using spaCy dependency parsing.
+
+    Sentences are streamed through nlp.pipe in batches, so memory does not grow with
+    the length of the speech and no Doc comes near spaCy's max_length.
     """
-    Calculate passive voice ratio using spaCy dependency parsing.
+    for doc in get_nlp().pipe(sentences, batch_size=batch_size):
+        passive_count = 0
+        active_count = 0
+
+        for token in doc:
+            # Passive subject (e.g., "The bill was passed")
+            if token.dep_ == "nsubjpass":
+                passive_count += 1
+            # Active subject (e.g., "We passed the bill")
+            elif token.dep_ == "nsubj" and token.head.pos_ == "VERB":
+                active_count += 1
+
+        yield passive_count, active_count
+
+
+def save_passive_sentences(df: pd.DataFrame, sentence_counts: list[tuple[int, int]]) -> Path:
+    """Write per-sentence passive voice counts and flags for one speech."""
+    counts = pd.DataFrame(sentence_counts, columns=["passive_count", "active_count"])
+    counts.insert(0, "sentence_id", df["sentence_id"].to_numpy())
+    counts["is_passive"] = counts["passive_count"] > 0
+
+    PASSIVE_SENTENCES_DIR.mkdir(exist_ok=True)
+    output_path = PASSIVE_SENTENCES_DIR / f"{df['year'].iloc[0]}.parquet"
+    counts.to_parquet(output_path, index=False)
+    return output_path
+
+
+def speech_features(df: pd.DataFrame) -> dict:
+    """Speech size."""
+    return {"total_sentences": len(df), "total_words": int(df["word_count"].sum())}
+
+
+def vocabulary_features(df: pd.DataFrame) -> dict:
+    """Vocabulary richness over the whole speech and per section, from one tokenization."""
+    df = df.reset_index(drop=True)
+    ids, lengths = encode_sentences(df["sentence_text"])
+    vocab = richness(ids)
+    return {
+        **{key: vocab[key] for key in ("ttr", "mtld", "hdd", "mattr", "unique_words")},
+        "sections": section_richness(df, ids, lengths),
+    }
+
+
+def ensure_marker_columns(df: pd.DataFrame) -> None:
+    """Add per-sentence marker count columns to df in place unless already present."""
+    if not set(MARKER_MATCHER.columns) <= set(df.columns):
+        df[MARKER_MATCHER.columns] = MARKER_MATCHER.count_by_sentence(df["sentence_text"]).values
+
+
+def ensure_passive_columns(df: pd.DataFrame) -> None:
+    """Add per-sentence passive/active subject columns to df in place (parsing if needed)."""
+    if not set(PASSIVE_COLUMNS) <= set(df.columns):
+        counts = np.array(list(passive_voice_counts(df["sentence_text"])), dtype=np.int64)
+        df[PASSIVE_COLUMNS] = counts.reshape(-1, 2)
+
 
-    Looks for passive subjects (nsubjpass) which indicate passive constructions.
+def marker_features(df: pd.DataFrame) -> dict:
+    """Temporal orientation and certainty index, from stored sentence columns or one scan."""
+    ensure_marker_columns(df)
+    markers = {column: int(df[column].sum()) for column in MARKER_MATCHER.columns}
+    return {**calculate_temporal_orientation(markers), **calculate_certainty_index(markers)}
+
+
+def passive_features(df: pd.DataFrame, save_sentences: bool = False) -> dict:
+    """
+    Passive voice ratio, from stored sentence columns or by parsing (optionally saved).
 
     Returns:
         - passive_count: Number of passive voice constructions
         - active_count: Number of active subjects
         - passive_ratio: passive / (passive + active), higher = more passive
     """
-    doc = nlp(text)
+    ensure_passive_columns(df)
+    passive, active = (int(df[column].sum()) for column in PASSIVE_COLUMNS)
+    if save_sentences:
+        save_passive_sentences(df, list(df[PASSIVE_COLUMNS].itertuples(index=False, name=None)))
+
+    total = passive + active
+    return {
+        "passive_count": passive,
+        "active_count": active,
+        "passive_ratio": round(passive / total, 4) if total > 0 else 0,
+    }
 
-    passive_count = 0
-    active_count = 0
 
-    for token in doc:
-        # Passive subject (e.g., "The bill was passed")
-        if token.dep_ == "nsubjpass":
-            passive_count += 1
-        # Active subject (e.g., "We passed the bill")
-        elif token.dep_ == "nsubj" and token.head.pos_ == "VERB":
-            active_count += 1
+def sliding_windows(
+    df: pd.DataFrame, window: int = WINDOW_SIZE, step: int = WINDOW_STEP
+) -> list[dict]:
+    """
+    Temporal, certainty and passive ratios and TTR over windows of consecutive sentences.
 
-    total = passive_count + active_count
+    Window sums of the sentence counts come from prefix sums. TTR keeps a running count
+    of the tokens inside the window: each sentence's tokens are added once when it
+    enters and removed once when it leaves, so the pass is linear in the speech length
+    and only the current window's tokens are held.
+    """
+    ensure_marker_columns(df)
+    ensure_passive_columns(df)
+    ids, lengths = encode_sentences(df["sentence_text"])
+    bounds = np.concatenate([[0], np.cumsum(lengths)]).tolist()
+
+    prefix = np.vstack(
+        [
+            np.zeros((1, len(SENTENCE_FEATURE_COLUMNS)), dtype=np.int64),
+            np.cumsum(df[SENTENCE_FEATURE_COLUMNS].to_numpy(dtype=np.int64), axis=0),
+        ]
+    )
+    column = {name: i for i, name in enumerate(SENTENCE_FEATURE_COLUMNS)}
+
+    def ratio(totals: np.ndarray, numerator: str, other: str, empty: float) -> float:
+        total = totals[column[numerator]] + totals[column[other]]
+        return round(float(totals[column[numerator]] / total), 4) if total > 0 else empty
+
+    sentences = len(df)
+    starts = list(range(0, max(sentences - window, 0) + 1, step))
+    # Close with a window ending on the last sentence so the whole speech is covered
+    if starts[-1] + window < sentences:
+        starts.append(sentences - window)
+
+    tokens = ids.tolist()
+    in_window: dict[int, int] = {}
+    low = high = 0  # token range currently counted
+
+    windows = []
+    for start in starts:
+        end = min(start + window, sentences)
+
+        for token in tokens[high : bounds[end]]:
+            in_window[token] = in_window.get(token, 0) + 1
+        for token in tokens[low : bounds[start]]:
+            in_window[token] -= 1
+            if in_window[token] == 0:
+                del in_window[token]
+        low, high = bounds[start], bounds[end]
+
+        totals = prefix[end] - prefix[start]
+        windows.append(
+            {
+                "start": start,
+                "end": end,
+                "temporal_ratio": ratio(totals, "forward_count", "backward_count", 0.5),
+                "certainty_ratio": ratio(totals, "certainty_count", "hedge_count", 0.5),
+                "passive_ratio": ratio(totals, "passive_count", "active_count", 0),
+                "ttr": round(len(in_window) / (high - low), 4) if high > low else 0,
+            }
+        )
+    return windows
+
+
+def window_features(df: pd.DataFrame) -> dict:
+    """Sliding-window series along the speech."""
+    return {"windows": sliding_windows(df)}
+
+
+# Feature groups in output column order; each is cached and recomputed independently
+FEATURE_GROUPS = {
+    "speech": speech_features,
+    "vocabulary": vocabulary_features,
+    "markers": marker_features,
+    "passive": passive_features,
+    "windows": window_features,
+}
+
+
+def feature_fingerprints() -> dict[str, str]:
+    """
+    Hash of everything besides the speech text that each feature group depends on.
 
+    Bump a group's "version" when its computation changes.
+    """
+    inputs = {
+        "speech": {"version": 1},
+        "vocabulary": {"version": 2},
+        "markers": {"version": 1, "markers": MARKER_CATEGORIES},
+        "passive": {
+            "version": 1,
+            "spacy": spacy.__version__,
+            "model": "en_core_web_sm",
+            "exclude": SPACY_EXCLUDE,
+        },
+    }
+    inputs["windows"] = {
+        "version": 1,
+        "window": WINDOW_SIZE,
+        "step": WINDOW_STEP,
+        "markers": inputs["markers"],
+        "passive": inputs["passive"],
+    }
     return {
-        "passive_count": passive_count,
-        "active_count": active_count,
-        "passive_ratio": round(passive_count / total, 4) if total > 0 else 0,
+        group: hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()[:16]
+        for group, value in inputs.items()
     }
 
 
-def analyze_speech(year: int) -> dict | None:
-    """Analyze a single speech and return all linguistic metrics."""
+# Processor columns the feature groups read. Columns other stages add to the same
+# parquet (topics, sentence features) leave the cache valid.
+SOURCE_COLUMNS = ["sentence_text", "section_title", "word_count"]
+
+
+def source_sha256(path: Path) -> str:
+    """Hash of a year parquet's source columns, ignoring any other columns."""
+    table = pq.read_table(path, columns=SOURCE_COLUMNS)
+    return hashlib.sha256(json.dumps(table.to_pydict()).encode()).hexdigest()
+
+
+def compute_speech_features(
+    year: int, cache_dir: Path | None = None, save_sentences: bool = False
+) -> tuple[dict | None, list[str]]:
+    """
+    Compute one speech's feature row, reusing cached feature groups where possible.
+
+    A cached group is reused when the hash of the speech's source columns and the group's
+    fingerprint both match. The passive group also keeps its per-sentence counts, so
+    recomputing windows after a marker list edit does not parse the speech again.
+    Returns the row and the names of the groups that were recomputed.
+    """
     filepath = PROCESSOR_DIR / f"{year}.parquet"
 
     if not filepath.exists():
         print(f"  ⚠ File not found: {filepath}")
-        return None
+        return None, []
+
+    fingerprints = feature_fingerprints()
+    source_hash = source_sha256(filepath)
+
+    cache_path = cache_dir / f"{year}.json" if cache_dir is not None else None
+    cached: dict = {}
+    if cache_path is not None and cache_path.exists():
+        entry = json.loads(cache_path.read_text())
+        if entry.get("source_sha256") == source_hash:
+            cached = entry["groups"]
+
+    df = None
+    groups = {}
+    recomputed = []
+    for group, compute in FEATURE_GROUPS.items():
+        fresh = group in cached and cached[group]["fingerprint"] == fingerprints[group]
+        # Per-sentence passive output is only written when the parser actually runs
+        if fresh and not (group == "passive" and save_sentences):
+            groups[group] = cached[group]
+            continue
+
+        if df is None:
+            df = pd.read_parquet(filepath)
+            # Stored sentence columns are only trusted if computed with the current inputs
+            for stale in stale_sentence_groups(filepath):
+                df = df.drop(columns=SENTENCE_COLUMN_GROUPS[stale], errors="ignore")
+            # Otherwise take passive counts from a cached parse, so windows need not parse
+            passive = cached.get("passive", {})
+            if (
+                not set(PASSIVE_COLUMNS) <= set(df.columns)
+                and passive.get("fingerprint") == fingerprints["passive"]
+                and len(passive.get("sentences", [])) == len(df)
+            ):
+                df[PASSIVE_COLUMNS] = np.array(passive["sentences"], dtype=np.int64)
+        if group == "passive":
+            compute = partial(passive_features, save_sentences=save_sentences)
+        groups[group] = {"fingerprint": fingerprints[group], "values": compute(df)}
+        if group == "passive":
+            # Per-sentence counts (not part of the row) for later window recomputes
+            groups[group]["sentences"] = df[PASSIVE_COLUMNS].to_numpy().tolist()
+        recomputed.append(group)
+
+    if cache_path is not None and recomputed:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {"year": year, "source_sha256": source_hash, "groups": groups}
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(entry, indent=2))
+        tmp_path.replace(cache_path)
+
+    row = {"year": year}
+    for group in FEATURE_GROUPS:
+        row.update(groups[group]["values"])
+    return row, recomputed
+
+
+def analyze_speech(year: int, save_sentences: bool = False) -> dict | None:
+    """
+    Analyze a single speech and return all linguistic metrics (without caching).
 
-    df = pd.read_parquet(filepath)
+    The row's "sections" entry lists vocabulary richness per section and its "windows"
+    entry the sliding-window series along the speech.
 
-    # Combine all sentences into full text
-    full_text = " ".join(df["sentence_text"].tolist())
-    total_sentences = len(df)
-    total_words = df["word_count"].sum()
+    With save_sentences, per-sentence passive voice counts are written to
+    passive_voice/{year}.parquet.
+    """
+    row, _ = compute_speech_features(year, save_sentences=save_sentences)
+    return row
 
-    # Calculate all metrics
-    vocab = calculate_vocabulary_richness(full_text)
-    temporal = calculate_temporal_orientation(full_text)
-    certainty = calculate_certainty_index(full_text)
-    passive = calculate_passive_voice_ratio(full_text)
 
-    return {
-        "year": year,
-        "total_sentences": total_sentences,
-        "total_words": int(total_words),
-        # Vocabulary richness
-        "ttr": vocab["ttr"],
-        "mtld": vocab["mtld"],
-        "unique_words": vocab["unique_words"],
-        # Temporal orientation
-        "forward_count": temporal["forward_count"],
-        "backward_count": temporal["backward_count"],
-        "temporal_ratio": temporal["temporal_ratio"],
-        # Certainty index
-        "hedge_count": certainty["hedge_count"],
-        "certainty_count": certainty["certainty_count"],
-        "certainty_ratio": certainty["certainty_ratio"],
-        # Passive voice
-        "passive_count": passive["passive_count"],
-        "active_count": passive["active_count"],
-        "passive_ratio": passive["passive_ratio"],
-    }
+def run_years(
+    years: Iterable[int],
+    workers: int | None = None,
+    cache_dir: Path | None = CACHE_DIR,
+    save_sentences: bool = False,
+) -> Iterator[tuple[int, dict | None, list[str]]]:
+    """
+    Compute feature rows for many speeches, one process per year.
+
+    Yields (year, row, recomputed groups) in year order. Pass workers=1 to run serially.
+    """
+    years = list(years)
+    if workers == 1:
+        for year in years:
+            yield (year, *compute_speech_features(year, cache_dir, save_sentences))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map() yields in submission order, keeping the rows in year order
+        tasks = executor.map(
+            compute_speech_features, years, repeat(cache_dir), repeat(save_sentences)
+        )
+        for year, (row, recomputed) in zip(years, tasks):
+            yield year, row, recomputed
+
+
+# ============================================
+# PER-SENTENCE FEATURE COLUMNS
+# ============================================
+
+PASSIVE_COLUMNS = ["passive_count", "active_count"]
+SENTENCE_FEATURE_COLUMNS = MARKER_MATCHER.columns + PASSIVE_COLUMNS
+
+# Sentence columns per feature group, each stored with the fingerprint of that group's
+# inputs (in the parquet schema metadata) so a marker list edit leaves the parse valid
+SENTENCE_COLUMN_GROUPS = {"markers": MARKER_MATCHER.columns, "passive": PASSIVE_COLUMNS}
+SENTENCE_FINGERPRINT_KEYS = {
+    "markers": b"linguistic_markers_fingerprint",
+    "passive": b"linguistic_passive_fingerprint",
+}
+
+
+def stale_sentence_groups(file_path: Path) -> list[str]:
+    """Sentence column groups of a parquet file that are missing or computed with other inputs."""
+    fingerprints = feature_fingerprints()
+    return [
+        group
+        for group, key in SENTENCE_FINGERPRINT_KEYS.items()
+        if read_parquet_metadata(file_path, key) != fingerprints[group]
+    ]
+
+
+def sentence_features(
+    sentences: pd.Series, groups: Iterable[str] = tuple(SENTENCE_COLUMN_GROUPS)
+) -> pd.DataFrame:
+    """Marker and/or passive voice counts for each sentence, indexed like the input."""
+    groups = [group for group in SENTENCE_COLUMN_GROUPS if group in groups]
+    features = sentences.to_frame("sentence_text")
+    if "markers" in groups:
+        ensure_marker_columns(features)
+    if "passive" in groups:
+        ensure_passive_columns(features)
+    return features[[column for group in groups for column in SENTENCE_COLUMN_GROUPS[group]]]
+
+
+def annotate_parquet_file(
+    file_path: Path, groups: Iterable[str] = tuple(SENTENCE_COLUMN_GROUPS)
+) -> int:
+    """Add or replace the sentence feature columns (of the given groups) of one year parquet."""
+    groups = list(groups)
+    df = pd.read_parquet(file_path, columns=["sentence_text"])
+    features = sentence_features(df["sentence_text"], groups)
+    fingerprints = feature_fingerprints()
+    metadata = {SENTENCE_FINGERPRINT_KEYS[group]: fingerprints[group].encode() for group in groups}
+    update_parquet_columns(file_path, features, metadata)
+    return len(df)
+
+
+def annotate_parquet_files(parquet_dir: Path = PROCESSOR_DIR) -> int:
+    """Recompute the sentence column groups of every year parquet that are missing or stale."""
+    annotated = 0
+    for file_path in sorted(parquet_dir.glob("*.parquet")):
+        stale = stale_sentence_groups(file_path)
+        if not stale:
+            continue
+        annotated += annotate_parquet_file(file_path, stale)
+        print(f"  ✓ Annotated {file_path.name} ({', '.join(stale)})")
+    return annotated
+
+
+def load_sentence_features(
+    parquet_dir: Path = PROCESSOR_DIR, columns: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Load all year parquets with their per-sentence feature columns.
+
+    Column groups that are missing or stale in a file are computed in memory
+    (run with --annotate to persist them instead).
+    """
+    read_columns = None if columns is None else list(dict.fromkeys(columns + ["sentence_text"]))
+
+    dfs = []
+    for file_path in sorted(parquet_dir.glob("*.parquet")):
+        stale = stale_sentence_groups(file_path)
+        stale_columns = [column for group in stale for column in SENTENCE_COLUMN_GROUPS[group]]
+        stored = [column for column in SENTENCE_FEATURE_COLUMNS if column not in stale_columns]
+        df = pd.read_parquet(
+            file_path, columns=None if read_columns is None else read_columns + stored
+        )
+        df = df.drop(columns=stale_columns, errors="ignore")
+        if stale:
+            df = df.join(sentence_features(df["sentence_text"], stale))
+            other = [column for column in df.columns if column not in SENTENCE_FEATURE_COLUMNS]
+            df = df[other + SENTENCE_FEATURE_COLUMNS]
+        dfs.append(df)
+
+    return pd.concat(dfs, ignore_index=True)
+
+
+def aggregate_sentence_features(df: pd.DataFrame, by: str | list[str]) -> pd.DataFrame:
+    """
+    Sum sentence feature columns per group and derive the temporal, certainty and
+    passive ratios, e.g. aggregate_sentence_features(df, ["year", "section_title"]).
+    """
+    totals = df.groupby(by, sort=True)[SENTENCE_FEATURE_COLUMNS].sum()
+
+    def ratio(numerator: pd.Series, other: pd.Series, empty: float) -> pd.Series:
+        total = numerator + other
+        return (numerator / total.where(total > 0)).round(4).fillna(empty)
+
+    totals["temporal_ratio"] = ratio(totals["forward_count"], totals["backward_count"], 0.5)
+    totals["certainty_ratio"] = ratio(totals["certainty_count"], totals["hedge_count"], 0.5)
+    totals["passive_ratio"] = ratio(totals["passive_count"], totals["active_count"], 0)
+    return totals.reset_index()
 
 
 def main():
     """Run linguistic analysis on all budget speeches."""
+    parser = argparse.ArgumentParser(description="Linguistic feature analysis")
+    parser.add_argument(
+        "--save-passive-sentences",
+        action="store_true",
+        help="Also write per-sentence passive voice counts to analysis/passive_voice/",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count, 1 = serial)",
+    )
+    parser.add_argument(
+        "--annotate",
+        action="store_true",
+        help="First store per-sentence feature columns in parquets that lack current ones",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute every year instead of reusing cached feature groups",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("🔤 LINGUISTIC FEATURE ANALYSIS")
     print("=" * 60)
 
-    results = []
-    years = range(1960, 2026)
+    if args.annotate:
+        print("Annotating sentences...")
+        annotate_parquet_files()
+
+    years = sorted(int(path.stem) for path in PROCESSOR_DIR.glob("*.parquet"))
+    cache_dir = None if args.no_cache else CACHE_DIR
 
-    for year in years:
-        print(f"  Analyzing {year}...", end=" ")
-        result = analyze_speech(year)
+    results = []
+    sections = []
+    windows = []
+    for year, result, recomputed in run_years(
+        years, args.workers, cache_dir, args.save_passive_sentences
+    ):
         if result:
+            sections.extend({"year": year, **section} for section in result.pop("sections"))
+            windows.extend({"year": year, **window} for window in result.pop("windows"))
             results.append(result)
+            status = ", ".join(recomputed) if recomputed else "cached"
             print(
-                f"TTR={result['ttr']:.3f}, "
+                f"  {year}: TTR={result['ttr']:.3f}, "
                 f"Temporal={result['temporal_ratio']:.2f}, "
                 f"Certainty={result['certainty_ratio']:.2f}, "
-                f"Passive={result['passive_ratio']:.2f}"
+                f"Passive={result['passive_ratio']:.2f} ({status})"
             )
 
     # Create DataFrame and save
@@ -319,8 +964,20 @@ def main():
     output_path = ANALYSIS_DIR / "linguistic_features.csv"
     df.to_csv(output_path, index=False)
 
+    sections_path = ANALYSIS_DIR / "linguistic_sections.csv"
+    pd.DataFrame(sections).to_csv(sections_path, index=False)
+
+    # Window settings travel with the series, so exports need not import this module
+    windows_path = ANALYSIS_DIR / "linguistic_windows.csv"
+    windows_df = pd.DataFrame(windows)
+    windows_df["window_size"] = WINDOW_SIZE
+    windows_df["window_step"] = WINDOW_STEP
+    windows_df.to_csv(windows_path, index=False)
+
     print("\n" + "=" * 60)
     print(f"✅ Saved to {output_path}")
+    print(f"✅ Saved per-section richness to {sections_path}")
+    print(f"✅ Saved sliding-window series to {windows_path}")
     print("=" * 60)
 
     # Print summary statistics
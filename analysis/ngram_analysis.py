@@ -6,12 +6,21 @@ Extracts top n-grams (phrases) for each Finance Minister to reveal
 distinctive language patterns and policy emphases.
 """
 
+import argparse
+import hashlib
 import json
 import re
+import shutil
 import sys
-from collections import Counter
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from topic_classifier import TOPIC_COLUMNS, load_classified_sentences
 
 # Add extractor to path for speech_links
 sys.path.append(str(Path(__file__).parent.parent / "extractor"))
@@ -21,7 +30,22 @@ from speech_links import budget_speech_links  # noqa: E402
 # Paths
 ANALYSIS_DIR = Path(__file__).parent
 OUTPUT_DIR = ANALYSIS_DIR.parent / "docs" / "data" / "summary"
-MARKDOWN_DIR = ANALYSIS_DIR.parent / "output_markdown"
+OUTPUT_PROCESSOR_DIR = ANALYSIS_DIR.parent / "output_processor"
+STORE_DIR = ANALYSIS_DIR / ".ngram_store"
+
+# Bump when the counting itself changes, to rebuild existing n-gram stores
+STORE_VERSION = 2
+
+# N-gram keys pack one word id per WORD_BITS bits, so n-grams up to MAX_N fit in an int64
+WORD_BITS = 21
+MAX_N = 63 // WORD_BITS
+WORD_LIMIT = 1 << WORD_BITS
+
+# Sentence columns kept alongside the n-gram counts
+SENTENCE_COLUMNS = ["sentence_id", "section_title"]
+
+# Sentence columns phrases can be grouped by on the command line
+GROUPINGS = ["minister", "year", "decade", "section_title", "ministry_topic"]
 
 # Common stopwords and function words to filter out
 STOPWORDS = {
@@ -278,33 +302,164 @@ BORING_PHRASES = {
 }
 
 
-def is_boring_phrase(phrase: str) -> bool:
-    """Check if phrase should be filtered out."""
-    # Direct match
-    if phrase in BORING_PHRASES:
-        return True
-    # Contains certain noise patterns
-    noise_patterns = [
-        "hansard",
-        "annex",
-        "document",
-        "please refer",
-        "toannex",
-        "keng yam",
-        "richard hu",
-        "hu tsu",
-        "tsu tau",
-    ]
-    for pattern in noise_patterns:
-        if pattern in phrase:
-            return True
-    # Filter fiscal year references like "1971 72"
-    if re.match(r"^\d{4} \d{2}$", phrase):
-        return True
-    # Filter single letter combos like "p a p", "p m", "s c"
-    if re.match(r"^[a-z]( [a-z])+$", phrase):
-        return True
-    return False
+# Substrings that make any phrase containing them noise
+NOISE_PATTERNS = [
+    "hansard",
+    "annex",
+    "document",
+    "please refer",
+    "toannex",
+    "keng yam",
+    "richard hu",
+    "hu tsu",
+    "tsu tau",
+]
+
+
+class NgramEncoder:
+    """
+    Integer ids for words and packed int64 keys for n-grams.
+
+    Word ids start at 1 (0 marks a sentence boundary) and each takes WORD_BITS bits of
+    the key, so keys are unique across n and stay valid as the vocabulary grows.
+    """
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.words: list[str] = [""]
+
+    def encode(self, words: Iterable[str]) -> np.ndarray:
+        """Map words to ids, adding unseen words to the vocabulary."""
+        return np.array([self._word_id(word) for word in words], dtype=np.int64)
+
+    def encode_sentences(self, sentences: Iterable[list[str]]) -> np.ndarray:
+        """Map tokenized sentences to one id sequence, with a 0 after each sentence."""
+        ids = []
+        for words in sentences:
+            ids.extend(self._word_id(word) for word in words)
+            ids.append(0)
+        return np.array(ids, dtype=np.int64)
+
+    def _word_id(self, word: str) -> int:
+        word_id = self.ids.get(word)
+        if word_id is None:
+            word_id = self.ids[word] = len(self.words)
+            if word_id >> WORD_BITS:
+                raise ValueError(f"Vocabulary exceeds {2**WORD_BITS - 1:,} words")
+            self.words.append(word)
+        return word_id
+
+    @staticmethod
+    def unpack(keys: np.ndarray) -> np.ndarray:
+        """Word ids of packed keys as an (m, MAX_N) array, last word first, 0-padded."""
+        return np.stack(
+            [(keys >> (WORD_BITS * j)) & (WORD_LIMIT - 1) for j in range(MAX_N)], axis=1
+        )
+
+    @staticmethod
+    def pack(windows: np.ndarray) -> np.ndarray:
+        """Pack an (m, n) array of word ids into one int64 key per row."""
+        n = windows.shape[1]
+        if n > MAX_N:
+            raise ValueError(f"N-grams are limited to n <= {MAX_N}, got {n}")
+        keys = windows[:, 0].copy()
+        for j in range(1, n):
+            keys <<= WORD_BITS
+            keys |= windows[:, j]
+        return keys
+
+    def decode(self, key: int) -> str:
+        """Materialize the phrase for a packed key."""
+        words = []
+        while key:
+            words.append(self.words[key & (WORD_LIMIT - 1)])
+            key >>= WORD_BITS
+        return " ".join(reversed(words))
+
+
+class PhraseFilter:
+    """
+    Stopword and boring-phrase filters as boolean arrays over an encoder's vocabulary.
+
+    Rejects n-grams without building any strings: stopwords at either end,
+    BORING_PHRASES, any phrase containing one of NOISE_PATTERNS (single-word patterns
+    within one word, k-word patterns across k adjacent words), fiscal year references
+    like "1971 72" and single-letter runs like "p a p". N-grams crossing a sentence
+    boundary are dropped too. The masks grow with the vocabulary, so text can be encoded
+    after the filter is built.
+    """
+
+    def __init__(self, encoder: NgramEncoder):
+        self.encoder = encoder
+
+        predicates = {
+            "stopword": lambda w: w in STOPWORDS,
+            "noise": lambda w: any(p in w for p in NOISE_PATTERNS if " " not in p),
+            "four_digits": lambda w: re.fullmatch(r"\d{4}", w) is not None,
+            "two_digits": lambda w: re.fullmatch(r"\d{2}", w) is not None,
+            "single_letter": lambda w: re.fullmatch(r"[a-z]", w) is not None,
+        }
+        # A k-word pattern lies within k adjacent words: the first ends with its first
+        # word, the last starts with its last word and any between equal its middle words
+        self.spanning_noise = []
+        for pattern in NOISE_PATTERNS:
+            if " " in pattern:
+                words = pattern.split(" ")
+                if not all(words):
+                    raise ValueError(
+                        f"Noise pattern {pattern!r} must be words separated by single spaces"
+                    )
+                names = [f"ends_{words[0]}"]
+                predicates[names[0]] = lambda w, head=words[0]: w.endswith(head)
+                for middle in words[1:-1]:
+                    names.append(f"equals_{middle}")
+                    predicates[names[-1]] = lambda w, middle=middle: w == middle
+                names.append(f"starts_{words[-1]}")
+                predicates[names[-1]] = lambda w, tail=words[-1]: w.startswith(tail)
+                self.spanning_noise.append(names)
+        self.predicates = predicates
+        self.masks = {name: np.zeros(1, dtype=bool) for name in predicates}
+
+        self.boring_keys: dict[int, np.ndarray] = {}
+        for phrase in sorted(BORING_PHRASES):
+            ids = encoder.encode(phrase.split())
+            self.boring_keys.setdefault(len(ids), []).append(ids)
+        for n, rows in self.boring_keys.items():
+            if n <= MAX_N:
+                self.boring_keys[n] = encoder.pack(np.array(rows))
+
+    def _refresh(self) -> dict[str, np.ndarray]:
+        """Extend the masks to words added to the vocabulary since the last call."""
+        known = len(self.masks["stopword"])
+        new_words = self.encoder.words[known:]
+        if new_words:
+            for name, predicate in self.predicates.items():
+                flags = np.fromiter(map(predicate, new_words), dtype=bool, count=len(new_words))
+                self.masks[name] = np.concatenate([self.masks[name], flags])
+        return self.masks
+
+    def keep(self, windows: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        """Boolean mask of the n-gram rows (and their packed keys) that survive filtering."""
+        masks = self._refresh()
+        n = windows.shape[1]
+        keep = windows.all(axis=1)
+        keep &= ~(masks["stopword"][windows[:, 0]] | masks["stopword"][windows[:, -1]])
+        keep &= ~masks["noise"][windows].any(axis=1)
+        for names in self.spanning_noise:
+            k = len(names)
+            if k > n:
+                continue
+            spans = np.ones((len(windows), n - k + 1), dtype=bool)
+            for j, name in enumerate(names):
+                spans &= masks[name][windows[:, j : n - k + 1 + j]]
+            keep &= ~spans.any(axis=1)
+        if n == 2:
+            keep &= ~(masks["four_digits"][windows[:, 0]] & masks["two_digits"][windows[:, 1]])
+        if n >= 2:
+            keep &= ~masks["single_letter"][windows].all(axis=1)
+        if n in self.boring_keys:
+            keep &= ~np.isin(keys, self.boring_keys[n])
+        return keep
 
 
 def get_minister_for_year(year: int) -> Optional[str]:
@@ -315,70 +470,439 @@ def get_minister_for_year(year: int) -> Optional[str]:
     return None
 
 
-def load_speech_text(year: int) -> str:
-    """Load and clean speech text for a given year."""
-    filepath = MARKDOWN_DIR / f"{year}.md"
-    if not filepath.exists():
-        return ""
+def tokenize_sentence(sentence: str) -> list[str]:
+    """Lowercase a sentence and split it into words, treating punctuation as spaces."""
+    return re.sub(r"[^\w\s]", " ", sentence.lower()).split()
 
-    with open(filepath, encoding="utf-8") as f:
-        text = f.read()
 
-    # Remove markdown headers and formatting
-    text = re.sub(r"^#.*$", "", text, flags=re.MULTILINE)
-    text = re.sub(r"\*\*|__", "", text)
-    text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
+def speech_sentences(file_path: Path) -> pd.DataFrame:
+    """Sentence ids and sections of one processor parquet (no text), in sentence order."""
+    sentences = pd.read_parquet(file_path, columns=SENTENCE_COLUMNS)
+    sentences["year"] = int(file_path.stem)
+    return sentences
 
-    # Clean and normalize
-    text = text.lower()
-    text = re.sub(r"[^\w\s]", " ", text)
-    text = re.sub(r"\s+", " ", text)
 
-    return text.strip()
+def sentence_text_sha256(file_path: Path) -> str:
+    """Hash of a processor parquet's sentence text, ignoring any other columns."""
+    texts = pq.read_table(file_path, columns=["sentence_text"]).column("sentence_text")
+    return hashlib.sha256("\0".join(text or "" for text in texts.to_pylist()).encode()).hexdigest()
 
 
-def extract_ngrams(text: str, n: int) -> list[str]:
-    """Extract n-grams from text."""
-    words = text.split()
-    ngrams = []
+def ngram_occurrences(
+    ids: np.ndarray,
+    n_values: Iterable[int],
+    phrase_filter: PhraseFilter,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find the filtered n-grams of an id sequence (0 ids end each sentence).
 
-    for i in range(len(words) - n + 1):
-        ngram = " ".join(words[i : i + n])
-        # Filter out ngrams with stopwords at start/end
-        ngram_words = ngram.split()
-        if ngram_words[0] in STOPWORDS or ngram_words[-1] in STOPWORDS:
-            continue
-        # Filter out ngrams that are all stopwords
-        if all(w in STOPWORDS for w in ngram_words):
-            continue
-        # Filter out boring phrases using pattern matching
-        if is_boring_phrase(ngram):
+    Returns the packed key of every occurrence and the index of the sentence it is in.
+    Every word is also returned on its own, unfiltered (keys below WORD_LIMIT), as the
+    word frequencies collocation statistics need.
+    """
+    sentence_at = np.cumsum(ids == 0) - (ids == 0)
+    words = ids > 0
+    all_keys, all_sentences = [ids[words]], [sentence_at[words]]
+    for n in n_values:
+        if len(ids) < n:
             continue
-        ngrams.append(ngram)
+        windows = np.lib.stride_tricks.sliding_window_view(ids, n)
+        keys = NgramEncoder.pack(windows)
+        keep = phrase_filter.keep(windows, keys)
+        all_keys.append(keys[keep])
+        all_sentences.append(sentence_at[: len(windows)][keep])
+    return np.concatenate(all_keys), np.concatenate(all_sentences)
+
+
+def run_starts(*columns: np.ndarray) -> np.ndarray:
+    """Indices where any of the (jointly sorted) columns changes value."""
+    if not len(columns[0]):
+        return np.empty(0, dtype=np.int64)
+    changed = np.zeros(len(columns[0]) - 1, dtype=bool)
+    for column in columns:
+        changed |= column[1:] != column[:-1]
+    return np.concatenate([[0], np.flatnonzero(changed) + 1])
+
+
+def count_speech_ngrams(
+    file_path: Path,
+    n_values: Iterable[int],
+    phrase_filter: PhraseFilter,
+    batch_size: int = 2048,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count the n-grams of every sentence in one processor parquet.
 
-    return ngrams
+    Streams sentence_text in batches, so no speech is ever held as one string.
+    Returns aligned arrays of sentence index, packed key and count, one row per
+    distinct (sentence, phrase), sorted by sentence then key.
+    """
+    keys, sentence_index = [], []
+    offset = 0
+    for batch in pq.ParquetFile(file_path).iter_batches(
+        batch_size=batch_size, columns=["sentence_text"]
+    ):
+        texts = batch.column("sentence_text").to_pylist()
+        ids = phrase_filter.encoder.encode_sentences(
+            tokenize_sentence(text or "") for text in texts
+        )
+        batch_keys, batch_sentences = ngram_occurrences(ids, n_values, phrase_filter)
+        keys.append(batch_keys)
+        sentence_index.append(batch_sentences + offset)
+        offset += len(texts)
+
+    if not keys:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    keys, sentence_index = np.concatenate(keys), np.concatenate(sentence_index)
+    order = np.lexsort((keys, sentence_index))
+    keys, sentence_index = keys[order], sentence_index[order]
+    starts = run_starts(sentence_index, keys)
+    counts = np.diff(np.append(starts, len(keys)))
+    return sentence_index[starts], keys[starts], counts
 
 
 def calculate_tfidf_boost(
-    phrase: str,
-    minister_count: int,
-    minister_total: int,
-    all_ministers_count: dict[str, int],
-) -> float:
+    group_count: np.ndarray,
+    group_total: int,
+    groups_using: np.ndarray,
+    total_groups: int,
+) -> np.ndarray:
     """
     Calculate a TF-IDF-like score to boost distinctive phrases.
-    Phrases used more by this minister relative to others get higher scores.
+    Phrases used more by this group (e.g. minister) relative to others get higher scores.
+
+    Works elementwise, so a whole array of phrase counts (with the number of
+    groups using each phrase) is scored at once.
     """
-    tf = minister_count / max(minister_total, 1)
+    tf = group_count / max(group_total, 1)
+
+    # IDF-like score (higher if fewer groups use it)
+    idf = 1 + (total_groups - groups_using) / total_groups
 
-    # Count how many ministers use this phrase
-    ministers_using = sum(1 for count in all_ministers_count.values() if count > 0)
-    total_ministers = len(all_ministers_count)
+    return tf * idf * group_count
 
-    # IDF-like score (higher if fewer ministers use it)
-    idf = 1 + (total_ministers - ministers_using) / total_ministers
 
-    return tf * idf * minister_count
+def reachable_phrases(
+    group_count: np.ndarray, group_total: int, total_groups: int, top_k: int
+) -> np.ndarray:
+    """
+    Mask of the phrases whose score can still reach a group's top k.
+
+    The idf factor of calculate_tfidf_boost lies between 1 (every group uses the
+    phrase) and 2 - 1/total_groups (only this group does), so each count bounds its
+    score from both sides. A phrase whose best case (rounded) is below the k-th best
+    worst case is out, before any document frequency is looked up.
+    """
+    if len(group_count) <= top_k:
+        return np.ones(len(group_count), dtype=bool)
+    lowest = calculate_tfidf_boost(group_count, group_total, total_groups, total_groups)
+    highest = calculate_tfidf_boost(group_count, group_total, 1, total_groups)
+    floor = np.partition(lowest, len(lowest) - top_k)[len(lowest) - top_k]
+    return np.round(highest, 4) >= np.round(floor, 4)
+
+
+def top_k_order(scores: np.ndarray, tiebreak: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, ties by smallest tiebreak.
+
+    Only the scores at or above the k-th best (found with a partial partition) are
+    sorted, so this is linear in the number of scores.
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.arange(len(scores))
+    if len(scores) > k:
+        threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= threshold)
+    order = np.lexsort((tiebreak[candidates], -scores[candidates]))[:k]
+    return candidates[order]
+
+
+class NgramTable:
+    """
+    Corpus-wide n-gram counts per sentence.
+
+    Each row is a distinct (sentence, phrase) pair with its count, in corpus order;
+    single words are kept apart in the same layout (row_word_*). `sentences` describes
+    every sentence (sentence_id, section_title, year, minister, decade), so counts for
+    any grouping of sentences are one sort away and never need the text to be
+    tokenized again.
+    """
+
+    def __init__(
+        self,
+        encoder: NgramEncoder,
+        sentences: pd.DataFrame,
+        row_sentence: np.ndarray,
+        row_key: np.ndarray,
+        row_count: np.ndarray,
+    ):
+        self.encoder = encoder
+        self.sentences = sentences.reset_index(drop=True)
+        self.sentences["minister"] = self.sentences["year"].map(get_minister_for_year)
+        self.sentences["decade"] = (self.sentences["year"] // 10 * 10).astype(str) + "s"
+
+        # Single words are keyed by their id
+        is_word = row_key < WORD_LIMIT
+        self.row_word_sentence = row_sentence[is_word].astype(np.int32)
+        self.row_word = row_key[is_word].astype(np.int32)
+        self.row_word_count = row_count[is_word].astype(np.int64)
+
+        # Phrases become indices into the sorted distinct keys
+        is_phrase = ~is_word
+        self.phrase_keys, row_phrase = np.unique(row_key[is_phrase], return_inverse=True)
+        self.row_sentence = row_sentence[is_phrase].astype(np.int32)
+        self.row_phrase = row_phrase.astype(np.int32)
+        self.row_count = row_count[is_phrase].astype(np.int64)
+
+    @classmethod
+    def from_years(
+        cls,
+        encoder: NgramEncoder,
+        years: Iterable[tuple[pd.DataFrame, tuple[np.ndarray, np.ndarray, np.ndarray]]],
+    ) -> "NgramTable":
+        """Stack per-year (sentences, count rows) in year order into one table."""
+        frames, row_sentence, row_key, row_count = [], [], [], []
+        offset = 0
+        for sentences, (sentence_index, keys, counts) in years:
+            frames.append(sentences)
+            row_sentence.append(sentence_index + offset)
+            row_key.append(keys)
+            row_count.append(counts)
+            offset += len(sentences)
+        return cls(
+            encoder,
+            pd.concat(frames, ignore_index=True),
+            np.concatenate(row_sentence),
+            np.concatenate(row_key),
+            np.concatenate(row_count),
+        )
+
+    def group_labels(self, group) -> pd.Series:
+        """
+        Resolve a grouping to one label per sentence.
+
+        `group` is a column of `sentences` (ministry_topic is attached on first use),
+        or any array-like aligned with `sentences`; null labels are left out.
+        """
+        if isinstance(group, str):
+            if group not in self.sentences and group in TOPIC_COLUMNS:
+                topics = load_classified_sentences(columns=["sentence_id"])
+                self.sentences = self.sentences.merge(
+                    topics[["sentence_id", *TOPIC_COLUMNS]], on="sentence_id", how="left"
+                )
+            if group not in self.sentences:
+                raise KeyError(f"Unknown grouping column: {group}")
+            return self.sentences[group]
+
+        labels = pd.Series(group)
+        if len(labels) != len(self.sentences):
+            raise ValueError(
+                f"Grouping has {len(labels):,} labels for {len(self.sentences):,} sentences"
+            )
+        return labels
+
+    def group_counts(
+        self, group, words: bool = False
+    ) -> tuple[pd.Index, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Phrase (or, with words=True, single word) counts per group.
+
+        Returns the group names (in order of first appearance) and, sorted by group then
+        phrase index (word id), aligned arrays of group index, phrase index (word id),
+        count and first row (corpus order).
+        """
+        if words:
+            row_sentence, row_item, row_count = (
+                self.row_word_sentence,
+                self.row_word,
+                self.row_word_count,
+            )
+        else:
+            row_sentence, row_item, row_count = self.row_sentence, self.row_phrase, self.row_count
+
+        codes, names = pd.factorize(self.group_labels(group).to_numpy())
+        row_group = codes[row_sentence]
+        rows = np.flatnonzero(row_group >= 0)
+        row_group, row_item = row_group[rows], row_item[rows]
+
+        # Stable sort, so the first row of each run is the phrase's first use in the group
+        order = np.lexsort((row_item, row_group))
+        rows, row_group, row_item = rows[order], row_group[order], row_item[order]
+        starts = run_starts(row_group, row_item)
+        counts = row_count[rows]
+        counts = np.add.reduceat(counts, starts) if len(starts) else counts
+        return pd.Index(names), row_group[starts], row_item[starts], counts, rows[starts]
+
+    def distinctive_phrases(self, group, top_k: int = 15, min_count: int = 3) -> dict:
+        """
+        Top phrases per group, scored with calculate_tfidf_boost.
+
+        Args:
+            group: Column of `sentences` (minister, year, decade, section_title,
+                ministry_topic) or labels aligned with `sentences`
+            top_k: Number of phrases to return per group
+            min_count: Minimum uses of a phrase within a group
+
+        Returns:
+            Dictionary of group -> list of {"phrase", "count", "score"}
+        """
+        names, groups, phrases, counts, first = self.group_counts(group)
+        groups_using = np.bincount(phrases, minlength=len(self.phrase_keys))
+        bounds = np.searchsorted(groups, np.arange(len(names) + 1))
+
+        results = {}
+        for g, name in enumerate(names):
+            group_phrases = phrases[bounds[g] : bounds[g + 1]]
+            group_counts = counts[bounds[g] : bounds[g + 1]]
+            group_first = first[bounds[g] : bounds[g + 1]]
+            group_total = int(group_counts.sum())
+
+            # Minimum frequency threshold, then drop phrases that cannot reach the top k
+            keep = group_counts >= min_count
+            keep[keep] = reachable_phrases(group_counts[keep], group_total, len(names), top_k)
+            group_phrases = group_phrases[keep]
+            group_counts = group_counts[keep]
+            group_first = group_first[keep]
+
+            # Calculate distinctiveness scores
+            scores = calculate_tfidf_boost(
+                group_counts, group_total, groups_using[group_phrases], len(names)
+            )
+            scores = np.round(scores, 4)
+
+            # Best k by score (ties keep speech order)
+            order = top_k_order(scores, group_first, top_k)
+            results[name] = [
+                {
+                    "phrase": self.encoder.decode(int(self.phrase_keys[group_phrases[i]])),
+                    "count": int(group_counts[i]),
+                    "score": float(scores[i]),
+                }
+                for i in order
+            ]
+
+        return results
+
+
+def ngram_fingerprint(n_values: Iterable[int]) -> str:
+    """Hash of everything besides the speech text that stored n-gram counts depend on."""
+    inputs = {
+        "version": STORE_VERSION,
+        "n_values": list(n_values),
+        "word_bits": WORD_BITS,
+        "stopwords": sorted(STOPWORDS),
+        "boring_phrases": sorted(BORING_PHRASES),
+        "noise_patterns": NOISE_PATTERNS,
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class NgramStore:
+    """
+    Per-year n-gram counts persisted on disk and updated incrementally.
+
+    Layout of store_dir:
+        vocabulary.parquet      one word per row; row i is word id i (append-only)
+        counts/{year}.parquet   sentence, ngram_id (packed key), count
+        manifest.json           fingerprint, and the sentence text hash of each counted year
+
+    A year is recounted only when its sentence text changes, so adding a speech counts
+    one year. Changing n_values or the phrase filters (see ngram_fingerprint) rebuilds
+    the store.
+    """
+
+    def __init__(self, store_dir: Path = STORE_DIR, n_values: Iterable[int] = (2, 3)):
+        self.store_dir = store_dir
+        self.n_values = tuple(n_values)
+        self.fingerprint = ngram_fingerprint(self.n_values)
+        self.counts_dir = store_dir / "counts"
+        self.manifest_path = store_dir / "manifest.json"
+        self.vocabulary_path = store_dir / "vocabulary.parquet"
+
+    def _read_manifest(self) -> dict:
+        if self.manifest_path.exists():
+            manifest = json.loads(self.manifest_path.read_text())
+            if manifest.get("fingerprint") == self.fingerprint:
+                return manifest
+        return {"fingerprint": self.fingerprint, "n_values": list(self.n_values), "years": {}}
+
+    def _read_encoder(self) -> NgramEncoder:
+        encoder = NgramEncoder()
+        if self.vocabulary_path.exists():
+            words = pq.read_table(self.vocabulary_path).column("word").to_pylist()
+            encoder.words = words
+            encoder.ids = {word: i for i, word in enumerate(words) if i}
+        return encoder
+
+    def update(self, parquet_dir: Path = OUTPUT_PROCESSOR_DIR) -> list[int]:
+        """Count every year whose sentence text changed since it was stored; returns them."""
+        manifest = self._read_manifest()
+        if not manifest["years"]:
+            shutil.rmtree(self.counts_dir, ignore_errors=True)
+        self.counts_dir.mkdir(parents=True, exist_ok=True)
+
+        encoder = self._read_encoder()
+        vocabulary_size = len(encoder.words)
+        phrase_filter = PhraseFilter(encoder)
+
+        stored = dict(manifest["years"])
+        manifest["years"] = {}
+        updated = []
+        for file_path in sorted(parquet_dir.glob("*.parquet")):
+            year = file_path.stem
+            text_hash = sentence_text_sha256(file_path)
+            counts_path = self.counts_dir / f"{year}.parquet"
+            if stored.get(year) != text_hash or not counts_path.exists():
+                sentence_index, keys, counts = count_speech_ngrams(
+                    file_path, self.n_values, phrase_filter
+                )
+                table = pa.table(
+                    {
+                        "sentence": sentence_index.astype(np.int32),
+                        "ngram_id": keys,
+                        "count": counts.astype(np.int32),
+                    }
+                )
+                pq.write_table(table, counts_path)
+                updated.append(int(year))
+            manifest["years"][year] = text_hash
+
+        for year in stored.keys() - manifest["years"].keys():
+            (self.counts_dir / f"{year}.parquet").unlink(missing_ok=True)
+
+        if len(encoder.words) != vocabulary_size or not self.vocabulary_path.exists():
+            pq.write_table(pa.table({"word": encoder.words}), self.vocabulary_path)
+        # Manifest last, so an interrupted update is redone next time
+        self.manifest_path.write_text(json.dumps(manifest, indent=2))
+        return updated
+
+    def year_counts(self, year: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Stored (sentence, ngram_id, count) rows of one year."""
+        table = pq.read_table(self.counts_dir / f"{year}.parquet")
+        return tuple(table.column(name).to_numpy() for name in ["sentence", "ngram_id", "count"])
+
+    def table(self, parquet_dir: Path = OUTPUT_PROCESSOR_DIR) -> NgramTable:
+        """NgramTable of every stored year (call update first)."""
+        years = sorted(int(year) for year in self._read_manifest()["years"])
+        return NgramTable.from_years(
+            self._read_encoder(),
+            (
+                (speech_sentences(parquet_dir / f"{year}.parquet"), self.year_counts(year))
+                for year in years
+            ),
+        )
+
+
+@lru_cache(maxsize=None)
+def load_ngram_table(n_values: tuple[int, ...] = (2, 3)) -> NgramTable:
+    """Corpus n-gram table from the n-gram store, updating any years that changed."""
+    store = NgramStore(n_values=n_values)
+    updated = store.update()
+    if updated:
+        print(f"  ✓ Counted n-grams for {len(updated)} year(s)")
+    return store.table()
 
 
 def analyze_minister_ngrams(
@@ -395,76 +919,22 @@ def analyze_minister_ngrams(
     Returns:
         Dictionary with minister n-gram data
     """
-    # Group speeches by minister
-    minister_texts: dict[str, str] = {}
-    minister_years: dict[str, list[int]] = {}
-
-    for year in range(1960, 2026):
-        minister = get_minister_for_year(year)
-        if not minister:
-            continue
-
-        text = load_speech_text(year)
-        if not text:
-            continue
-
-        if minister not in minister_texts:
-            minister_texts[minister] = ""
-            minister_years[minister] = []
-
-        minister_texts[minister] += " " + text
-        minister_years[minister].append(year)
-
-    # Extract n-grams for each minister
-    minister_ngrams: dict[str, Counter] = {}
-    all_ngrams: Counter = Counter()
-
-    for minister, text in minister_texts.items():
-        ngrams: list[str] = []
-        for n in n_values:
-            ngrams.extend(extract_ngrams(text, n))
-
-        minister_ngrams[minister] = Counter(ngrams)
-        all_ngrams.update(ngrams)
+    table = load_ngram_table(tuple(n_values))
+    minister_phrases = table.distinctive_phrases("minister", top_k=top_k)
+    minister_years = table.sentences.groupby("minister", sort=False)["year"].unique()
 
-    # Calculate scores and get top phrases per minister
     results: dict[str, object] = {
         "ministers": {},
         "metadata": {"n_values": n_values, "top_k": top_k},
     }
     ministers_dict: dict[str, object] = {}
 
-    for minister, ngram_counts in minister_ngrams.items():
-        total_ngrams = sum(ngram_counts.values())
-
-        # Get counts from all ministers for each phrase
-        scored_phrases = []
-        for phrase, count in ngram_counts.items():
-            if count < 3:  # Minimum frequency threshold
-                continue
-
-            # Get this phrase's count for all ministers
-            all_minister_counts = {m: minister_ngrams[m].get(phrase, 0) for m in minister_ngrams}
-
-            # Calculate distinctiveness score
-            score = calculate_tfidf_boost(phrase, count, total_ngrams, all_minister_counts)
-
-            scored_phrases.append(
-                {
-                    "phrase": phrase,
-                    "count": count,
-                    "score": round(score, 4),
-                }
-            )
-
-        # Sort by score and get top k
-        scored_phrases.sort(key=lambda x: x["score"], reverse=True)
-        top_phrases = scored_phrases[:top_k]
-
+    for minister, phrases in minister_phrases.items():
+        years = minister_years[minister]
         ministers_dict[minister] = {
-            "years": f"{min(minister_years[minister])}-{max(minister_years[minister])}",
-            "num_speeches": len(minister_years[minister]),
-            "phrases": top_phrases,
+            "years": f"{years.min()}-{years.max()}",
+            "num_speeches": len(years),
+            "phrases": phrases,
         }
 
     results["ministers"] = ministers_dict
@@ -496,5 +966,32 @@ def export_ngrams_json():
     return results
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Distinctive n-grams in budget speeches")
+    parser.add_argument(
+        "--group",
+        choices=GROUPINGS,
+        help="Print distinctive phrases per group instead of exporting minister_ngrams.json",
+    )
+    parser.add_argument("--top-k", type=int, default=15, help="Phrases per group")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Discard the n-gram store and count every year"
+    )
+    args = parser.parse_args()
+
+    if args.rebuild:
+        shutil.rmtree(STORE_DIR, ignore_errors=True)
+
+    if not args.group:
+        export_ngrams_json()
+        return
+
+    print(f"📊 Distinctive phrases by {args.group}...")
+    for name, phrases in load_ngram_table().distinctive_phrases(args.group, args.top_k).items():
+        print(f"\n  {name}:")
+        for entry in phrases:
+            print(f"    {entry['phrase']} ({entry['count']}, {entry['score']})")
+
+
 if __name__ == "__main__":
-    export_ngrams_json()
+    main()
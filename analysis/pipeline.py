@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Site Data Pipeline for Singapore Budget Speeches
+
+Regenerates everything under docs/data (and the analysis CSVs it is built from) with
+one command. Each stage runs one of the analysis scripts and declares the files it
+reads and writes; a stage that reads another stage's output runs after it, stages
+that do not depend on each other run in parallel, and a stage whose inputs are
+unchanged since its last successful run (and whose outputs exist) is skipped.
+
+    poetry run python analysis/pipeline.py                 # everything that changed
+    poetry run python analysis/pipeline.py search_index    # one stage and what it needs
+    poetry run python analysis/pipeline.py --dry-run       # show what would run
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from graphlib import TopologicalSorter
+
+# Paths
+ANALYSIS_DIR = Path(__file__).parent
+BASE_DIR = ANALYSIS_DIR.parent
+MANIFEST_PATH = ANALYSIS_DIR / ".pipeline_manifest.json"
+
+PARQUETS = "output_processor/*.parquet"
+SUMMARY = "docs/data/summary"
+
+# Local modules the scripts import, directly or through each other
+CLASSIFIER = ["analysis/topic_classifier.py", "processor/writer.py"]
+NGRAMS = ["analysis/ngram_analysis.py", *CLASSIFIER, "extractor/speech_links.py"]
+EXPORT = ["analysis/export_for_web.py", *CLASSIFIER]
+
+# Stages: the script (and arguments) each runs, the files it reads (glob patterns,
+# including the code it depends on) and the files or directories it writes, all
+# relative to the repository root. "pool" marks scripts that start their own worker
+# processes and take a --workers count
+STAGES = {
+    "classify": {
+        "command": ["analysis/topic_classifier.py"],
+        "inputs": [*CLASSIFIER, PARQUETS],
+        "outputs": [PARQUETS],
+    },
+    "linguistic": {
+        "command": ["analysis/linguistic_features.py"],
+        "pool": True,
+        "inputs": ["analysis/linguistic_features.py", *CLASSIFIER, PARQUETS],
+        "outputs": [
+            "analysis/linguistic_features.csv",
+            "analysis/linguistic_sections.csv",
+            "analysis/linguistic_windows.csv",
+        ],
+    },
+    "countries": {
+        "command": ["analysis/country_extraction.py"],
+        "pool": True,
+        "inputs": ["analysis/country_extraction.py", PARQUETS],
+        "outputs": [
+            f"{SUMMARY}/global_overview.json",
+            f"{SUMMARY}/global_time_series.json",
+            f"{SUMMARY}/global_country_details.json",
+            f"{SUMMARY}/global_map_data.json",
+            f"{SUMMARY}/global_cube.json",
+            f"{SUMMARY}/global_co_mentions.json",
+        ],
+    },
+    "ngrams": {
+        "command": ["analysis/ngram_analysis.py"],
+        "inputs": [*NGRAMS, PARQUETS],
+        "outputs": [f"{SUMMARY}/minister_ngrams.json", "analysis/.ngram_store"],
+    },
+    "collocations": {
+        "command": ["analysis/collocations.py"],
+        "inputs": [
+            "analysis/collocations.py",
+            *NGRAMS,
+            "analysis/.ngram_store/manifest.json",
+            PARQUETS,
+        ],
+        "outputs": [f"{SUMMARY}/minister_collocations.json"],
+    },
+    "ministries": {
+        "command": ["analysis/export_for_web.py", "ministries"],
+        "inputs": [*EXPORT, "analysis/ministry_by_year.csv"],
+        "outputs": [f"{SUMMARY}/ministries_overview.json"],
+    },
+    "ministers": {
+        "command": ["analysis/export_for_web.py", "ministers"],
+        "inputs": [
+            *EXPORT,
+            "analysis/yearly_speech_statistics.csv",
+            "analysis/ministry_by_minister.csv",
+        ],
+        "outputs": [f"{SUMMARY}/ministers_overview.json"],
+    },
+    "yearly": {
+        "command": ["analysis/export_for_web.py", "yearly"],
+        "inputs": [
+            *EXPORT,
+            "analysis/yearly_speech_statistics.csv",
+            "analysis/linguistic_features.csv",
+        ],
+        "outputs": [f"{SUMMARY}/yearly_overview.json"],
+    },
+    "linguistic_windows": {
+        "command": ["analysis/export_for_web.py", "linguistic_windows"],
+        "inputs": [*EXPORT, "analysis/linguistic_windows.csv"],
+        "outputs": [f"{SUMMARY}/linguistic_windows.json"],
+    },
+    "search_index": {
+        "command": ["analysis/export_for_web.py", "search_index"],
+        "inputs": [*EXPORT, PARQUETS],
+        "outputs": ["docs/data/search-index"],
+    },
+}
+
+
+def produces(output: str, input_pattern: str) -> bool:
+    """Whether a stage output (file, directory or glob) feeds an input pattern."""
+    return (
+        output == input_pattern
+        or fnmatch.fnmatch(output, input_pattern)
+        or input_pattern.startswith(output.rstrip("/") + "/")
+    )
+
+
+def stage_graph(stages: dict = STAGES) -> dict[str, set[str]]:
+    """Stage -> stages it depends on, derived from declared inputs and outputs."""
+    return {
+        name: {
+            other
+            for other, upstream in stages.items()
+            if other != name
+            and any(
+                produces(output, pattern)
+                for output in upstream["outputs"]
+                for pattern in stage["inputs"]
+            )
+        }
+        for name, stage in stages.items()
+    }
+
+
+def with_dependencies(targets: list[str], graph: dict[str, set[str]]) -> set[str]:
+    """The target stages and everything they (transitively) depend on."""
+    selected: set[str] = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(graph[name])
+    return selected
+
+
+def input_fingerprint(stage: dict) -> str:
+    """Hash of a stage's command and the content of every file its inputs match."""
+    digest = hashlib.sha256(json.dumps(stage["command"]).encode())
+    for pattern in stage["inputs"]:
+        for path in sorted(BASE_DIR.glob(pattern)):
+            if path.is_file():
+                digest.update(str(path.relative_to(BASE_DIR)).encode())
+                digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def outputs_exist(stage: dict) -> bool:
+    return all(any(BASE_DIR.glob(output)) for output in stage["outputs"])
+
+
+def load_manifest() -> dict:
+    if MANIFEST_PATH.exists():
+        return json.loads(MANIFEST_PATH.read_text())
+    return {}
+
+
+def save_manifest(manifest: dict):
+    tmp_path = MANIFEST_PATH.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    tmp_path.replace(MANIFEST_PATH)
+
+
+def is_up_to_date(name: str, manifest: dict) -> bool:
+    stage = STAGES[name]
+    return manifest.get(name) == input_fingerprint(stage) and outputs_exist(stage)
+
+
+def run_stage(name: str, workers: int = 1) -> tuple[int, str, float]:
+    """Run one stage's script; returns its exit code, combined output and duration."""
+    # Printed here rather than on submission, so only stages holding a worker show as running
+    print(f"  ▶️  {name}: running", flush=True)
+    start = time.perf_counter()
+    command = [sys.executable, *STAGES[name]["command"]]
+    if STAGES[name].get("pool"):
+        command += ["--workers", str(workers)]
+    completed = subprocess.run(command, cwd=BASE_DIR, capture_output=True, text=True)
+    output = completed.stdout + completed.stderr
+    return completed.returncode, output, time.perf_counter() - start
+
+
+def run_pipeline(
+    targets: list[str] | None = None,
+    workers: int | None = None,
+    force: bool = False,
+    dry_run: bool = False,
+) -> bool:
+    """
+    Run the selected stages (default: all) in dependency order.
+
+    Stages run in their own Python processes and share a budget of `workers` processes
+    (default: CPU count): a stage takes one, and a pool stage takes every free one as
+    its --workers, so stages and their pools never run more processes than that.
+
+    A stage is skipped when its input fingerprint matches the manifest and its outputs
+    exist; it is checked only once its dependencies have finished, so upstream changes
+    are seen. A stage's fingerprint is removed from the manifest before it runs and
+    recorded again only after it succeeds (for stages that rewrite their own inputs,
+    such as classify, this is the rewritten state). Returns False if any stage failed.
+    """
+    graph = stage_graph()
+    selected = with_dependencies(targets or list(STAGES), graph)
+    sorter = TopologicalSorter({name: graph[name] & selected for name in sorted(selected)})
+    manifest = {} if force else load_manifest()
+    recorded = load_manifest()
+
+    if dry_run:
+        for name in sorter.static_order():
+            status = "up to date" if is_up_to_date(name, manifest) else "run"
+            deps = ", ".join(sorted(graph[name] & selected)) or "-"
+            print(f"  {name:20} {status:11} (after: {deps})")
+        return True
+
+    budget = workers or os.cpu_count() or 1
+    sorter.prepare()
+    failed: list[str] = []
+    blocked: set[str] = set()
+    waiting: list[str] = []
+    running = {}
+    with ThreadPoolExecutor(max_workers=budget) as executor:
+        while sorter.is_active():
+            for name in sorted(sorter.get_ready()):
+                if graph[name] & blocked:
+                    blocked.add(name)
+                    print(f"  ⏭️  {name}: skipped (dependency failed)")
+                    sorter.done(name)
+                elif is_up_to_date(name, manifest):
+                    print(f"  ✓ {name}: up to date")
+                    sorter.done(name)
+                else:
+                    waiting.append(name)
+
+            while waiting and budget:
+                name = waiting.pop(0)
+                # Drop the old fingerprint before the stage starts writing, so outputs left
+                # half-written by a failed or interrupted run never look up to date
+                manifest.pop(name, None)
+                if recorded.pop(name, None) is not None:
+                    save_manifest(recorded)
+                slots = budget if STAGES[name].get("pool") else 1
+                budget -= slots
+                running[executor.submit(run_stage, name, slots)] = name, slots
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in sorted(finished, key=lambda f: running[f]):
+                name, slots = running.pop(future)
+                budget += slots
+                returncode, output, seconds = future.result()
+                if returncode == 0:
+                    recorded[name] = manifest[name] = input_fingerprint(STAGES[name])
+                    save_manifest(recorded)
+                    print(f"  ✅ {name}: done in {seconds:.1f}s")
+                else:
+                    failed.append(name)
+                    blocked.add(name)
+                    print(f"  ❌ {name}: failed (exit {returncode})")
+                    print("\n".join(f"     {line}" for line in output.rstrip().splitlines()))
+                sorter.done(name)
+
+    if failed:
+        print(f"\n❌ Failed stages: {', '.join(failed)}")
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate the site data")
+    parser.add_argument(
+        "stages",
+        nargs="*",
+        help=f"Stages to run with their dependencies (default: all): {', '.join(STAGES)}",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes to run at once, shared by stages and their worker pools "
+        "(default: CPU count)",
+    )
+    parser.add_argument("--force", action="store_true", help="Run stages even if up to date")
+    parser.add_argument("--dry-run", action="store_true", help="Show the plan without running")
+    args = parser.parse_args()
+    unknown = [name for name in args.stages if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    print("=" * 60)
+    print("🔄 REGENERATING SITE DATA")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    ok = run_pipeline(args.stages, args.workers, args.force, args.dry_run)
+    if not args.dry_run:
+        print(f"\n{'✅' if ok else '❌'} Pipeline finished in {time.perf_counter() - start:.1f}s")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Native richness measures and sliding windows against straightforward reference computations."""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+from linguistic_features import (
+    HDD_DRAWS,
+    MATTR_WINDOW,
+    MTLD_THRESHOLD,
+    SENTENCE_FEATURE_COLUMNS,
+    encode_sentences,
+    hdd,
+    mattr,
+    mtld,
+    sliding_windows,
+    tokenize_words,
+)
+
+WORDS = [
+    *["the", "government", "will", "budget", "growth", "support", "households"],
+    *["we", "expect", "may", "must", "singapore", "economy", "revenue", "spending"],
+    *["co-payment", "U.S.", "GST", "2024", "S$1.5", "well—being", "year's", "e.g."],
+]
+
+
+def random_sentences(count: int, seed: int = 0) -> list[str]:
+    """Sentences with a skewed word distribution, so words repeat as in real text."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(WORDS))]
+    return [
+        " ".join(rng.choices(WORDS, weights, k=rng.randint(0, 25))).capitalize() + "."
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_richness_matches_lexicalrichness(seed):
+    lexicalrichness = pytest.importorskip("lexicalrichness")
+    sentences = random_sentences(60, seed)
+    ids, lengths = encode_sentences(sentences)
+    lex = lexicalrichness.LexicalRichness(" ".join(sentences))
+
+    assert len(ids) == lengths.sum() == lex.words
+    assert len(np.unique(ids)) == lex.terms
+    assert mtld(ids) == pytest.approx(lex.mtld(threshold=MTLD_THRESHOLD), rel=1e-12)
+    assert hdd(ids) == pytest.approx(lex.hdd(draws=HDD_DRAWS), rel=1e-12)
+    assert mattr(ids) == pytest.approx(lex.mattr(window_size=MATTR_WINDOW), rel=1e-12)
+
+
+def test_mattr_matches_window_by_window():
+    ids = np.random.default_rng(0).zipf(1.5, 400) % 60
+    for window in (1, 7, 100, 400):
+        ttrs = [len(set(ids[s : s + window])) / window for s in range(len(ids) - window + 1)]
+        assert mattr(ids, window) == pytest.approx(np.mean(ttrs), rel=1e-12)
+
+
+def reference_windows(df: pd.DataFrame, window: int, step: int) -> list[dict]:
+    """Recount every window from its own sentences."""
+
+    def ratio(rows, numerator, other, empty):
+        total = rows[numerator].sum() + rows[other].sum()
+        return round(float(rows[numerator].sum() / total), 4) if total > 0 else empty
+
+    sentences = len(df)
+    starts = list(range(0, max(sentences - window, 0) + 1, step))
+    if starts[-1] + window < sentences:
+        starts.append(sentences - window)
+
+    windows = []
+    for start in starts:
+        end = min(start + window, sentences)
+        rows = df.iloc[start:end]
+        tokens = [token for text in rows["sentence_text"] for token in tokenize_words(text)]
+        windows.append(
+            {
+                "start": start,
+                "end": end,
+                "temporal_ratio": ratio(rows, "forward_count", "backward_count", 0.5),
+                "certainty_ratio": ratio(rows, "certainty_count", "hedge_count", 0.5),
+                "passive_ratio": ratio(rows, "passive_count", "active_count", 0),
+                "ttr": round(len(set(tokens)) / len(tokens), 4) if tokens else 0,
+            }
+        )
+    return windows
+
+
+@pytest.mark.parametrize("sentences", [0, 1, 10, 49, 50, 51, 76, 130])
+@pytest.mark.parametrize("window, step", [(50, 25), (7, 3), (4, 4)])
+def test_sliding_windows_match_recounting(sentences, window, step):
+    rng = np.random.default_rng(sentences)
+    # Stored sentence columns are used as they are, so no parsing is needed
+    df = pd.DataFrame(
+        rng.integers(0, 3, (sentences, len(SENTENCE_FEATURE_COLUMNS))),
+        columns=SENTENCE_FEATURE_COLUMNS,
+    )
+    df["sentence_text"] = random_sentences(sentences, seed=sentences)
+
+    assert sliding_windows(df, window, step) == reference_windows(df, window, step)
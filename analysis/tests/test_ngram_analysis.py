@@ -0,0 +1,121 @@
+"""PhraseFilter and NgramEncoder against the string-based n-gram extraction they replaced."""
+
+import random
+import re
+
+import numpy as np
+import pytest
+from ngram_analysis import (
+    BORING_PHRASES,
+    MAX_N,
+    NOISE_PATTERNS,
+    STOPWORDS,
+    NgramEncoder,
+    PhraseFilter,
+    ngram_occurrences,
+)
+
+# Words that exercise every filter rule, including noise patterns inside and across words
+VOCABULARY = [
+    *["the", "of", "and", "to", "in", "a", "s", "c", "p", "m", "r", "d"],
+    *["per", "cent", "last", "year", "mr", "speaker", "budget", "speech", "lee", "hsien"],
+    *["hansard", "xhansard", "annex", "annexe", "toannex", "document", "documents"],
+    *["please", "xplease", "refer", "referral", "keng", "yam", "yams", "goh", "swee"],
+    *["richard", "hu", "shu", "hua", "tsu", "tsuk", "tau", "taut"],
+    *["1971", "72", "2024", "000", "7"],
+    *["economy", "growth", "workers", "singapore", "housing", "defence"],
+]
+
+
+def is_boring_phrase(phrase: str) -> bool:
+    """The original per-phrase check."""
+    if phrase in BORING_PHRASES:
+        return True
+    if any(pattern in phrase for pattern in NOISE_PATTERNS):
+        return True
+    if re.match(r"^\d{4} \d{2}$", phrase):
+        return True
+    return re.match(r"^[a-z]( [a-z])+$", phrase) is not None
+
+
+def extract_ngrams(text: str, n: int) -> list[str]:
+    """The original n-gram extraction, building and checking one string per n-gram."""
+    words = text.split()
+    ngrams = []
+    for i in range(len(words) - n + 1):
+        ngram_words = words[i : i + n]
+        if ngram_words[0] in STOPWORDS or ngram_words[-1] in STOPWORDS:
+            continue
+        ngram = " ".join(ngram_words)
+        if not is_boring_phrase(ngram):
+            ngrams.append(ngram)
+    return ngrams
+
+
+def random_sentences(count: int, seed: int = 0) -> list[list[str]]:
+    rng = random.Random(seed)
+    return [rng.choices(VOCABULARY, k=rng.randint(1, 12)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("n", range(1, MAX_N + 1))
+def test_phrase_filter_matches_extract_ngrams(n):
+    encoder = NgramEncoder()
+    phrase_filter = PhraseFilter(encoder)
+    for words in random_sentences(500, seed=n):
+        if len(words) < n:
+            continue
+        windows = np.lib.stride_tricks.sliding_window_view(encoder.encode(words), n)
+        keys = encoder.pack(windows)
+        kept = [encoder.decode(key) for key in keys[phrase_filter.keep(windows, keys)]]
+        assert kept == extract_ngrams(" ".join(words), n), words
+
+
+def test_ngram_occurrences_stay_within_sentences():
+    encoder = NgramEncoder()
+    phrase_filter = PhraseFilter(encoder)
+    sentences = random_sentences(300)
+    keys, sentence_index = ngram_occurrences(
+        encoder.encode_sentences(sentences), (2, 3), phrase_filter
+    )
+
+    expected = [
+        (i, phrase)
+        for i, words in enumerate(sentences)
+        for phrase in [*words, *extract_ngrams(" ".join(words), 2)]
+        + extract_ngrams(" ".join(words), 3)
+    ]
+    found = [(int(i), encoder.decode(int(key))) for key, i in zip(keys, sentence_index)]
+    assert sorted(found) == sorted(expected)
+
+
+def test_encoder_keys_round_trip():
+    encoder = NgramEncoder()
+    ids = encoder.encode("budget speech per cent budget".split())
+    assert ids.tolist() == [1, 2, 3, 4, 1]
+
+    for n in range(1, MAX_N + 1):
+        windows = np.lib.stride_tricks.sliding_window_view(ids, n)
+        keys = encoder.pack(windows)
+        unpacked = encoder.unpack(keys)
+        assert (unpacked[:, :n] == windows[:, ::-1]).all()
+        assert not unpacked[:, n:].any()
+        assert [encoder.decode(key) for key in keys] == [
+            " ".join(encoder.words[i] for i in row) for row in windows
+        ]
+
+
+def test_encoder_keys_are_unique_across_n():
+    encoder = NgramEncoder()
+    ids = encoder.encode(VOCABULARY)
+    keys = np.concatenate(
+        [
+            encoder.pack(np.lib.stride_tricks.sliding_window_view(ids, n))
+            for n in range(1, MAX_N + 1)
+        ]
+    )
+    assert len(np.unique(keys)) == len(keys)
+
+
+def test_encoder_rejects_long_ngrams():
+    with pytest.raises(ValueError):
+        NgramEncoder.pack(np.ones((1, MAX_N + 1), dtype=np.int64))
@@ -0,0 +1,159 @@
+"""Stage skipping, failure handling and the worker budget of the site data pipeline."""
+
+import ast
+import threading
+import time
+from pathlib import Path
+
+import pipeline
+import pytest
+
+REPO_DIR = Path(pipeline.__file__).parent.parent
+SOURCE_DIRS = ["analysis", "processor", "extractor"]
+
+STAGES = {
+    "source": {"command": ["source.py"], "inputs": ["data.txt"], "outputs": ["source.out"]},
+    "derived": {"command": ["derived.py"], "inputs": ["source.out"], "outputs": ["derived.out"]},
+    "pooled": {
+        "command": ["pooled.py"],
+        "inputs": ["other.txt"],
+        "outputs": ["pooled.out"],
+        "pool": True,
+    },
+    "plain": {"command": ["plain.py"], "inputs": ["other.txt"], "outputs": ["plain.out"]},
+}
+
+
+class FakeStages:
+    """Stands in for run_stage: writes each output from the stage's inputs, or fails."""
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = base_dir
+        self.runs: list[tuple[str, int]] = []
+        self.failing: set[str] = set()
+        self.processes = self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, name: str, workers: int = 1) -> tuple[int, str, float]:
+        with self.lock:
+            self.runs.append((name, workers))
+            self.processes += workers
+            self.peak = max(self.peak, self.processes)
+        time.sleep(0.05)
+        stage = STAGES[name]
+        content = "".join((self.base_dir / path).read_text() for path in stage["inputs"])
+        for output in stage["outputs"]:
+            (self.base_dir / output).write_text(f"{content} -> {name}\n")
+        with self.lock:
+            self.processes -= workers
+        return (1 if name in self.failing else 0), "stage output", 0.05
+
+    def ran(self) -> list[str]:
+        names = sorted(name for name, _ in self.runs)
+        self.runs.clear()
+        return names
+
+
+@pytest.fixture
+def stages(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "BASE_DIR", tmp_path)
+    monkeypatch.setattr(pipeline, "MANIFEST_PATH", tmp_path / "manifest.json")
+    monkeypatch.setattr(pipeline, "STAGES", STAGES)
+    monkeypatch.setattr(pipeline.stage_graph, "__defaults__", (STAGES,))
+    fake = FakeStages(tmp_path)
+    monkeypatch.setattr(pipeline, "run_stage", fake)
+    (tmp_path / "data.txt").write_text("data")
+    (tmp_path / "other.txt").write_text("other")
+    return fake
+
+
+def test_stage_graph_follows_outputs_to_inputs():
+    graph = pipeline.stage_graph(STAGES)
+    assert graph == {"source": set(), "derived": {"source"}, "pooled": set(), "plain": set()}
+    assert pipeline.with_dependencies(["derived"], graph) == {"source", "derived"}
+
+
+def test_unchanged_stages_are_skipped(stages):
+    assert pipeline.run_pipeline()
+    assert stages.ran() == ["derived", "plain", "pooled", "source"]
+    assert pipeline.run_pipeline()
+    assert stages.ran() == []
+
+
+def test_changed_input_reruns_stage_and_dependents(stages, tmp_path):
+    pipeline.run_pipeline()
+    stages.ran()
+    (tmp_path / "data.txt").write_text("new data")
+    assert pipeline.run_pipeline()
+    assert stages.ran() == ["derived", "source"]
+
+
+def test_missing_output_reruns_stage(stages, tmp_path):
+    pipeline.run_pipeline()
+    stages.ran()
+    (tmp_path / "derived.out").unlink()
+    assert pipeline.run_pipeline()
+    assert stages.ran() == ["derived"]
+
+
+def test_force_and_targets(stages):
+    pipeline.run_pipeline(["derived"])
+    assert stages.ran() == ["derived", "source"]
+    pipeline.run_pipeline(["derived"], force=True)
+    assert stages.ran() == ["derived", "source"]
+
+
+def test_failed_stage_is_not_recorded(stages, tmp_path):
+    pipeline.run_pipeline()
+    stages.ran()
+
+    (tmp_path / "data.txt").write_text("new data")
+    stages.failing.add("source")
+    assert not pipeline.run_pipeline()
+    assert stages.ran() == ["source"]  # derived is skipped
+    assert "source" not in pipeline.load_manifest()
+
+    # Back to the inputs of the last successful run: the half-written output still reruns
+    # (derived then sees the same output as before and stays up to date)
+    (tmp_path / "data.txt").write_text("data")
+    stages.failing.clear()
+    assert pipeline.run_pipeline()
+    assert stages.ran() == ["source"]
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+def test_stages_and_pools_share_the_worker_budget(stages, workers):
+    assert pipeline.run_pipeline(workers=workers)
+    assert stages.peak <= workers
+    assert all(count == 1 for name, count in stages.runs if not STAGES[name].get("pool"))
+
+
+def local_imports(path: Path) -> set[Path]:
+    """Repository modules a script imports, directly or through each other."""
+    found: set[Path] = set()
+    pending = [path]
+    while pending:
+        tree = ast.parse(pending.pop().read_text())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                for directory in SOURCE_DIRS:
+                    module = REPO_DIR / directory / f"{name}.py"
+                    if module.exists() and module not in found:
+                        found.add(module)
+                        pending.append(module)
+                        break
+    return found
+
+
+@pytest.mark.parametrize("name", list(pipeline.STAGES))
+def test_stage_inputs_list_imported_modules(name):
+    stage = pipeline.STAGES[name]
+    script = REPO_DIR / stage["command"][0]
+    required = {str(path.relative_to(REPO_DIR)) for path in local_imports(script) | {script}}
+    assert required <= set(stage["inputs"])
@@ -0,0 +1,71 @@
+"""The single-pass keyword matcher against `keyword in text` on every sentence."""
+
+import random
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+from topic_classifier import MINISTRY_TOPICS, KeywordClassifier, keyword_weight, trie_pattern
+
+# Keywords that are prefixes, suffixes and substrings of one another
+NESTED_TOPICS = {
+    "finance": {"keywords": ["tax", "tax rebate", "taxi", "rebate", "ax", "a"]},
+    "transport": {"keywords": ["taxi", "taxi fare", "fare", "far", "are"]},
+    "health": {"keywords": ["care", "healthcare", "health", "ear", "re"]},
+}
+
+
+def random_texts(topics: dict, count: int, seed: int = 0) -> list[str]:
+    """Texts built from keywords, keyword fragments and filler, in mixed case."""
+    rng = random.Random(seed)
+    keywords = sorted({kw for info in topics.values() for kw in info["keywords"]})
+    pieces = [*keywords, *(kw[: len(kw) // 2] for kw in keywords), "the", "of", " ", "-"]
+    texts = []
+    for _ in range(count):
+        text = "".join(rng.choice(pieces) + rng.choice(["", " "]) for _ in range(rng.randint(0, 8)))
+        texts.append(text.upper() if rng.random() < 0.2 else text)
+    return texts
+
+
+def reference_hits(classifier: KeywordClassifier, texts: list[str]) -> np.ndarray:
+    return np.array(
+        [[kw in text.lower() for kw in classifier.keywords] for text in texts], dtype=np.int64
+    ).reshape(len(texts), len(classifier.keywords))
+
+
+def reference_classify(topics: dict, text: str) -> tuple:
+    """The original per-sentence loop over ministries and keywords."""
+    scores = {
+        ministry: sum(keyword_weight(kw) for kw in info["keywords"] if kw in text.lower())
+        for ministry, info in topics.items()
+    }
+    best = max(scores, key=scores.get)
+    return (best, scores[best]) if scores[best] > 0 else ("general", 0)
+
+
+@pytest.mark.parametrize("topics", [NESTED_TOPICS, MINISTRY_TOPICS], ids=["nested", "ministries"])
+def test_keyword_hits_match_substring_search(topics):
+    classifier = KeywordClassifier(topics)
+    texts = random_texts(topics, 400)
+    hits = classifier.keyword_hits(texts).toarray()
+    assert (hits == reference_hits(classifier, texts)).all()
+
+
+@pytest.mark.parametrize("topics", [NESTED_TOPICS, MINISTRY_TOPICS], ids=["nested", "ministries"])
+def test_classify_matches_per_sentence_scoring(topics):
+    classifier = KeywordClassifier(topics)
+    texts = random_texts(topics, 400, seed=1)
+    batch = classifier.classify_batch(pd.Series(texts))
+    for text, (label, confidence) in zip(texts, batch.itertuples(index=False)):
+        assert (label, confidence) == reference_classify(topics, text), text
+        assert classifier.classify(text) == (label, confidence)
+
+
+def test_trie_pattern_matches_longest_keyword():
+    keywords = ["tax", "tax rebate", "taxi", "t", "rebate"]
+    pattern = re.compile(trie_pattern(keywords))
+    for text in ["tax rebates", "taxing", "taxi", "tea", "tax rebat"]:
+        longest = max((kw for kw in keywords if text.startswith(kw)), key=len, default=None)
+        match = pattern.match(text)
+        assert (match.group() if match else None) == longest
@@ -0,0 +1,636 @@
+"""
+Ministry topic classification shared by all analysis scripts
+
+Sentences are assigned to the ministry whose keywords they match with the highest
+weighted score (multi-word keywords weigh their word count), or to 'general' when no
+keyword matches. The classification stage runs once and stores `ministry_topic` and
+`topic_confidence` columns in the processor parquet files; consumers read them back with
+`load_classified_sentences`, which falls back to classifying in memory when the stored
+columns are missing or were produced from a different keyword list.
+"""
+
+import hashlib
+import json
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Add processor to path
+sys.path.append(str(Path(__file__).parent.parent / "processor"))
+
+from writer import read_parquet_metadata, update_parquet_columns  # noqa: E402
+
+OUTPUT_PROCESSOR_DIR = Path(__file__).parent.parent / "output_processor"
+
+TOPIC_COLUMNS = ["ministry_topic", "topic_confidence"]
+
+# Parquet schema metadata key holding the fingerprint of the keywords used
+FINGERPRINT_KEY = b"ministry_topic_fingerprint"
+
+# Ministry topics (mapped to current Singapore government ministries)
+MINISTRY_TOPICS = {
+    "communications_information": {
+        "keywords": [
+            "5g",
+            "broadband",
+            "broadcasting",
+            "communications",
+            "cyber",
+            "digital",
+            "imda",
+            "infocomm",
+            "information",
+            "internet",
+            "media",
+            "technology",
+            "telecommunications",
+        ],
+        "label": "Communications & Information",
+        "colour": "#4361EE",
+    },
+    "culture_community_youth": {
+        "keywords": [
+            "arts",
+            "community",
+            "community development",
+            "community services",
+            "culture",
+            "heritage",
+            "library",
+            "mccy",
+            "museum",
+            "racial harmony",
+            "recreation",
+            "sport",
+            "sports",
+            "youth",
+        ],
+        "label": "Culture, Community & Youth",
+        "colour": "#E63946",
+    },
+    "defence": {
+        "keywords": [
+            "against",
+            "air force",
+            "army",
+            "conditions",
+            "defence",
+            "defense",
+            "expansion",
+            "loans",
+            "military",
+            "mindef",
+            "national service",
+            "navy",
+            "ns",
+            "rsaf",
+            "rsn",
+            "saf",
+            "safti",
+            "security",
+        ],
+        "label": "Defence",
+        "colour": "#5F0F40",
+    },
+    "education": {
+        "keywords": [
+            "college",
+            "curriculum",
+            "education",
+            "ite",
+            "items",
+            "learning",
+            "moe",
+            "ntu",
+            "nus",
+            "polytechnic",
+            "preschool",
+            "primary",
+            "school",
+            "schools",
+            "secondary",
+            "skillsfuture",
+            "smu",
+            "states",
+            "student",
+            "students",
+            "teacher",
+            "tertiary",
+            "universities",
+            "university",
+        ],
+        "label": "Education",
+        "colour": "#C73E1D",
+    },
+    "finance": {
+        "keywords": [
+            "budget",
+            "corporate",
+            "corporate tax",
+            "customs",
+            "debt",
+            "deficit",
+            "duties",
+            "duty",
+            "estimated",
+            "excise",
+            "exemption",
+            "fiscal",
+            "gst",
+            "income",
+            "income tax",
+            "iras",
+            "personal",
+            "personal income",
+            "personal income tax",
+            "property",
+            "property tax",
+            "rates",
+            "revenue",
+            "revenues",
+            "stamp",
+            "stamp duty",
+            "surplus",
+            "tax",
+            "tax changes",
+            "tax exemption",
+            "tax rate",
+            "tax rates",
+            "taxes",
+            "treasury",
+            "financial policy",
+        ],
+        "label": "Finance",
+        "colour": "#2E86AB",
+    },
+    "foreign_affairs": {
+        "keywords": [
+            "ambassador",
+            "asean",
+            "asean economic",
+            "bilateral",
+            "diplomatic",
+            "economic cooperation",
+            "embassy",
+            "foreign",
+            "foreign exchange",
+            "international",
+            "mfa",
+            "overseas",
+            "overseas markets",
+            "relations",
+            "treaty",
+        ],
+        "label": "Foreign Affairs",
+        "colour": "#0077B6",
+    },
+    "health": {
+        "keywords": [
+            "careshield",
+            "clinic",
+            "disease",
+            "doctor",
+            "eldercare",
+            "eldershield",
+            "health",
+            "healthcare",
+            "healthcare needs",
+            "healthy",
+            "hospital",
+            "hospitals",
+            "medical",
+            "medisave",
+            "medisave top",
+            "medishield",
+            "medishield life",
+            "moh",
+            "nurse",
+            "patient",
+            "patients",
+            "polyclinic",
+            "polyclinics",
+        ],
+        "label": "Health",
+        "colour": "#6A994E",
+    },
+    "home_affairs": {
+        "keywords": [
+            "civil defence",
+            "crime",
+            "emergency",
+            "fire",
+            "home affairs",
+            "ica",
+            "immigration",
+            "law enforcement",
+            "police",
+            "safety",
+            "scdf",
+        ],
+        "label": "Home Affairs",
+        "colour": "#9B2226",
+    },
+    "law": {
+        "keywords": [
+            "attorney general",
+            "court",
+            "judge",
+            "judiciary",
+            "justice",
+            "law",
+            "legal",
+            "legislation",
+            "minlaw",
+            "regulation",
+            "statute",
+        ],
+        "label": "Law",
+        "colour": "#06668D",
+    },
+    "manpower": {
+        "keywords": [
+            "cpf",
+            "cpf contribution",
+            "employers",
+            "employment",
+            "foreign workers",
+            "jobs",
+            "labor",
+            "labour",
+            "low wage",
+            "manpower",
+            "ntuc",
+            "older workers",
+            "progressive wage",
+            "retirement",
+            "salary",
+            "skilled",
+            "skilled workers",
+            "skills",
+            "training",
+            "unemployment",
+            "wage",
+            "wage workers",
+            "wages",
+            "workers",
+            "workfare",
+            "workforce",
+        ],
+        "label": "Manpower",
+        "colour": "#F18F01",
+    },
+    "national_development": {
+        "keywords": [
+            "bca",
+            "bto",
+            "building",
+            "construction",
+            "estate",
+            "estate duty",
+            "estates",
+            "flat",
+            "flats",
+            "hdb",
+            "hdb flats",
+            "housing",
+            "inflation",
+            "inflationary",
+            "living room",
+            "planning",
+            "property",
+            "public housing",
+            "resale",
+            "room",
+            "room flats",
+            "room hdb",
+            "room hdb flats",
+            "town",
+            "ura",
+            "urban",
+        ],
+        "label": "National Development",
+        "colour": "#BC4749",
+    },
+    "social_family_development": {
+        "keywords": [
+            "aged",
+            "assistance",
+            "children",
+            "comcare",
+            "compact",
+            "elderly",
+            "family",
+            "family development",
+            "low income",
+            "msf",
+            "social",
+            "social compact",
+            "social support",
+            "subsidy",
+            "vulnerable",
+            "welfare",
+        ],
+        "label": "Social & Family Development",
+        "colour": "#F77F00",
+    },
+    "sustainability_environment": {
+        "keywords": [
+            "carbon",
+            "carbon emissions",
+            "carbon tax",
+            "climate",
+            "climate change",
+            "emission",
+            "emissions",
+            "energy",
+            "environment",
+            "green",
+            "nea",
+            "net zero",
+            "pollution",
+            "pub",
+            "recycling",
+            "renewable",
+            "sustainability",
+            "waste",
+            "water",
+        ],
+        "label": "Sustainability & Environment",
+        "colour": "#588157",
+    },
+    "trade_industry": {
+        "keywords": [
+            "assessment",
+            "business",
+            "businesses",
+            "commerce",
+            "edb",
+            "enterprise",
+            "enterprises",
+            "export",
+            "exports",
+            "fdi",
+            "import",
+            "important",
+            "imports",
+            "industrial",
+            "industry",
+            "innovation",
+            "investment",
+            "investments",
+            "manufacturing",
+            "manufacturing sector",
+            "productivity",
+            "sme",
+            "smes",
+            "startup",
+            "trade",
+            "economic",
+            "economy",
+            "economic development",
+            "global economy",
+        ],
+        "label": "Trade & Industry",
+        "colour": "#A23B72",
+    },
+    "transport": {
+        "keywords": [
+            "airport",
+            "bus",
+            "car",
+            "cars",
+            "changi airport",
+            "coe",
+            "erp",
+            "lrt",
+            "lta",
+            "maritime",
+            "mrt",
+            "opportunities",
+            "port",
+            "public transport",
+            "road",
+            "roads",
+            "shipping",
+            "smrt",
+            "taxi",
+            "taxis",
+            "traffic",
+            "train",
+            "transport",
+        ],
+        "label": "Transport",
+        "colour": "#386641",
+    },
+}
+
+
+def keyword_weight(keyword: str) -> int:
+    """Multi-word keywords are more specific, so they weigh their word count."""
+    word_count = len(keyword.split())
+    return word_count if word_count > 1 else 1
+
+
+def trie_pattern(keywords: List[str]) -> str:
+    """Build a regex alternation factored as a character trie (greedy, longest first)."""
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def prepare_corpus(texts: Iterable[str]) -> Tuple[str, np.ndarray]:
+    """
+    Lowercase and join sentences for a single matcher pass.
+
+    Returns the joined text and the start offset of each sentence (plus the end).
+    Keywords never contain newlines, so matches cannot span sentences.
+    """
+    texts = list(texts)
+    corpus = "\n".join(texts).lower()
+    offsets = np.cumsum([0] + [len(text) + 1 for text in texts])
+    return corpus, offsets
+
+
+def score_hits(
+    hits: sparse.spmatrix, weights: np.ndarray, ministries: List[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Score keyword hits per ministry and pick the best (ties go to the first ministry)."""
+    scores = np.asarray(hits @ weights)
+    best = scores.argmax(axis=1)
+    confidence = scores[np.arange(len(best)), best]
+    labels = np.array(ministries, dtype=object)[best]
+    labels[confidence == 0] = "general"
+    return labels, confidence
+
+
+class KeywordClassifier:
+    """
+    Weighted keyword classifier compiled into a single multi-pattern matcher.
+
+    All keywords of all ministries go into one trie-shaped regex wrapped in a lookahead,
+    so a single scan reports the longest keyword starting at every position. Shorter
+    keywords at the same position are its prefixes and are added from a precomputed
+    table, which reproduces the `keyword in text` substring semantics exactly.
+    """
+
+    def __init__(self, topics: Dict[str, Dict] = MINISTRY_TOPICS):
+        self.ministries = list(topics)
+        self.keywords = sorted({kw for info in topics.values() for kw in info["keywords"]})
+        self.keyword_ids = {kw: i for i, kw in enumerate(self.keywords)}
+
+        # keyword x ministry score contributions
+        self.weights = np.zeros((len(self.keywords), len(self.ministries)), dtype=np.int64)
+        for j, info in enumerate(topics.values()):
+            for kw in info["keywords"]:
+                self.weights[self.keyword_ids[kw], j] += keyword_weight(kw)
+
+        # every keyword that matches wherever `kw` matches (its prefixes, itself included)
+        self._same_start = {
+            kw: [self.keyword_ids[p] for p in self.keywords if kw.startswith(p)]
+            for kw in self.keywords
+        }
+        self._pattern = re.compile("(?=(" + trie_pattern(self.keywords) + "))")
+
+    def match(self, corpus: str, offsets: np.ndarray) -> sparse.csr_matrix:
+        """Return a binary sentences x keywords matrix of matches in a prepared corpus."""
+        positions = []
+        keyword_ids = []
+        for match in self._pattern.finditer(corpus):
+            ids = self._same_start[match.group(1)]
+            positions.extend([match.start()] * len(ids))
+            keyword_ids.extend(ids)
+
+        rows = np.searchsorted(offsets, positions, side="right") - 1
+        hits = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (rows, keyword_ids)),
+            shape=(len(offsets) - 1, len(self.keywords)),
+        )
+        # A keyword counts once per sentence no matter how often it occurs
+        hits.data[:] = 1
+        return hits
+
+    def keyword_hits(self, texts: Iterable[str]) -> sparse.csr_matrix:
+        """Return a binary sentences x keywords matrix of substring matches."""
+        return self.match(*prepare_corpus(texts))
+
+    def score(self, hits: sparse.csr_matrix) -> Tuple[np.ndarray, np.ndarray]:
+        """Turn a keyword hit matrix into (ministry label, confidence) arrays."""
+        return score_hits(hits, self.weights, self.ministries)
+
+    def classify(self, text: str) -> tuple:
+        """Classify a single sentence, returning (ministry, confidence)."""
+        labels, confidence = self.score(self.keyword_hits([text]))
+        return labels[0], int(confidence[0])
+
+    def classify_batch(self, texts: pd.Series) -> pd.DataFrame:
+        """Classify a column of sentences into ministry_topic / topic_confidence."""
+        labels, confidence = self.score(self.keyword_hits(texts))
+        return pd.DataFrame(
+            {"ministry_topic": labels, "topic_confidence": confidence}, index=texts.index
+        )
+
+
+@lru_cache(maxsize=1)
+def default_classifier() -> KeywordClassifier:
+    """Classifier over MINISTRY_TOPICS, compiled once per process."""
+    return KeywordClassifier(MINISTRY_TOPICS)
+
+
+def topic_fingerprint(topics: Dict[str, Dict] = MINISTRY_TOPICS) -> str:
+    """Hash of the keyword lists, used to detect stale stored classifications."""
+    keywords = {ministry: info["keywords"] for ministry, info in topics.items()}
+    return hashlib.sha256(json.dumps(keywords, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def topic_display_name(topic: str) -> str:
+    """Display name used on the website, e.g. 'trade_industry' -> 'Trade Industry'."""
+    return topic.replace("_", " ").title()
+
+
+def stored_fingerprint(file_path: Path) -> str:
+    """Fingerprint of the keywords a parquet file was classified with ('' if none)."""
+    return read_parquet_metadata(file_path, FINGERPRINT_KEY)
+
+
+def classify_parquet_file(file_path: Path, classifier: KeywordClassifier, fingerprint: str) -> int:
+    """Add or replace the topic columns of one parquet file in place."""
+    df = pd.read_parquet(file_path, columns=["sentence_text"])
+    topics = classifier.classify_batch(df["sentence_text"])
+    update_parquet_columns(file_path, topics, {FINGERPRINT_KEY: fingerprint.encode()})
+    return len(df)
+
+
+def classify_parquet_files(
+    parquet_dir: Path = OUTPUT_PROCESSOR_DIR, topics: Dict[str, Dict] = MINISTRY_TOPICS
+) -> int:
+    """Classify every year parquet, skipping files already classified with these keywords."""
+    classifier = KeywordClassifier(topics)
+    fingerprint = topic_fingerprint(topics)
+
+    classified = 0
+    for file_path in sorted(parquet_dir.glob("*.parquet")):
+        if stored_fingerprint(file_path) == fingerprint:
+            continue
+        classified += classify_parquet_file(file_path, classifier, fingerprint)
+        print(f"  ✓ Classified {file_path.name}")
+    return classified
+
+
+def load_classified_sentences(
+    parquet_dir: Path = OUTPUT_PROCESSOR_DIR, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Load all year parquets with their ministry_topic / topic_confidence columns.
+
+    Files whose stored classification is missing or stale are classified in memory
+    (run this module to persist the result instead).
+    """
+    fingerprint = topic_fingerprint()
+    read_columns = None if columns is None else list(dict.fromkeys(columns + ["sentence_text"]))
+
+    dfs = []
+    for file_path in sorted(parquet_dir.glob("*.parquet")):
+        if stored_fingerprint(file_path) == fingerprint:
+            stored = None if read_columns is None else read_columns + TOPIC_COLUMNS
+            dfs.append(pd.read_parquet(file_path, columns=stored))
+        else:
+            df = pd.read_parquet(file_path, columns=read_columns)
+            df = df.drop(columns=TOPIC_COLUMNS, errors="ignore")
+            df[TOPIC_COLUMNS] = default_classifier().classify_batch(df["sentence_text"])
+            dfs.append(df)
+
+    return pd.concat(dfs, ignore_index=True)
+
+
+def main():
+    print("=" * 60)
+    print("🏷️  CLASSIFYING SENTENCES BY MINISTRY TOPIC")
+    print("=" * 60)
+
+    classified = classify_parquet_files()
+    if classified:
+        print(f"\n✅ Classified {classified:,} sentences")
+    else:
+        print("\n✅ All parquet files are up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@
 
 let ministerData = null;
 let ngramData = null;
+let collocationData = null;
+let phrasesView = "distinctive";
 
 // Chronological order of ministers (source of truth from speech_links.py)
 // Portrait images - placeholder for now, to be updated with actual images
@@ -118,13 +120,20 @@ document.addEventListener("DOMContentLoaded", () => {
 // Load minister statistics
 async function loadMinisterData() {
   try {
-    const [ministersResponse, ngramsResponse] = await Promise.all([
-      fetch("data/summary/ministers_overview.json"),
-      fetch("data/summary/minister_ngrams.json"),
-    ]);
+    const [ministersResponse, ngramsResponse, collocationsResponse] =
+      await Promise.all([
+        fetch("data/summary/ministers_overview.json"),
+        fetch("data/summary/minister_ngrams.json"),
+        fetch("data/summary/minister_collocations.json").catch(() => null),
+      ]);
 
     ministerData = await ministersResponse.json();
     ngramData = await ngramsResponse.json();
+    // Collocations are optional; the toggle stays hidden without them
+    collocationData =
+      collocationsResponse && collocationsResponse.ok
+        ? await collocationsResponse.json()
+        : null;
 
     // Sort ministers chronologically
     ministerData.ministers = sortMinistersChronologically(
@@ -137,6 +146,7 @@ async function loadMinisterData() {
     renderOutputChart();
     renderStyleChart();
     renderTopicsHeatmap();
+    setupPhrasesToggle();
     renderPhrasesChart();
     renderMinisterProfiles();
   } catch (error) {
@@ -569,9 +579,33 @@ function renderTopicsHeatmap() {
   });
 }
 
+// Switch the phrases chart between distinctive phrases and collocations
+function setupPhrasesToggle() {
+  const toggle = document.getElementById("phrasesToggle");
+  if (!collocationData || !collocationData.ministers) {
+    toggle.style.display = "none";
+    return;
+  }
+
+  const buttons = {
+    distinctive: document.getElementById("phrasesDistinctive"),
+    collocations: document.getElementById("phrasesCollocations"),
+  };
+  Object.entries(buttons).forEach(([view, button]) => {
+    button.addEventListener("click", () => {
+      phrasesView = view;
+      Object.values(buttons).forEach((b) => b.classList.remove("active"));
+      button.classList.add("active");
+      renderPhrasesChart();
+    });
+  });
+}
+
 // Render distinctive phrases chart
 function renderPhrasesChart() {
-  if (!ngramData || !ngramData.ministers) return;
+  const phraseData =
+    phrasesView === "collocations" ? collocationData : ngramData;
+  if (!phraseData || !phraseData.ministers) return;
 
   const container = document.getElementById("phrasesChart");
 
@@ -584,7 +618,7 @@ function renderPhrasesChart() {
   let html = '<div class="phrases-grid">';
 
   orderedMinisters.forEach((ministerName) => {
-    const data = ngramData.ministers[ministerName];
+    const data = phraseData.ministers[ministerName];
     if (!data || !data.phrases) return;
 
     const info = getMinisterInfo(ministerName);
@@ -6,8 +6,18 @@
 // Cache for loaded shards
 const shardCache = new Map();
 
+// Prebuilt inverted index (see export_inverted_index in export_for_web.py):
+// postings are fetched per term prefix and sentence texts per block, so a
+// search downloads a few small files instead of every decade shard
+const INVERTED_PATH = "data/search-index/inverted";
+// Must match TOKEN_PATTERN in analysis/export_for_web.py
+const TOKEN_PATTERN = /[a-z0-9]+/g;
+const termShardCache = new Map();
+const textBlockCache = new Map();
+
 // Search state
 let searchIndex = null;
+let invertedIndex = null; // null: search by scanning the decade shards
 let currentResults = [];
 
 // Initialize search page
@@ -72,17 +82,21 @@ function setupEventListeners() {
 }
 
 // Re-sort current results and re-display them
-function resortAndDisplayResults() {
+async function resortAndDisplayResults() {
   const sortFilter = document.getElementById("sortFilter").value;
   sortResults(window.currentResults, sortFilter);
+  await loadSentenceTexts(window.currentResults.slice(0, 100));
   displayResults(window.currentResults, window.currentQuery);
 }
 
 // Load search index overview (lightweight)
 async function loadSearchOverview() {
   try {
-    const response = await fetch("data/search-index/overview.json");
-    searchIndex = await response.json();
+    const [overview] = await Promise.all([
+      fetch("data/search-index/overview.json").then((r) => r.json()),
+      loadInvertedIndex(),
+    ]);
+    searchIndex = overview;
     console.log("Search index overview loaded");
   } catch (error) {
     console.error("Failed to load search index:", error);
@@ -90,6 +104,18 @@ async function loadSearchOverview() {
   }
 }
 
+// Load the inverted index metadata; without it searches scan the decade shards
+async function loadInvertedIndex() {
+  try {
+    const response = await fetch(`${INVERTED_PATH}/index.json`);
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    invertedIndex = await response.json();
+  } catch (error) {
+    console.warn("Inverted index unavailable, using shard scan:", error);
+    invertedIndex = null;
+  }
+}
+
 // Perform search
 async function performSearch() {
   const query = document
@@ -109,20 +135,34 @@ async function performSearch() {
   showStatus("Searching...");
 
   try {
-    // Determine which shards to load
-    const shardsToLoad = determineShards(decadeFilter, topicFilter);
-
-    // Load required shards
-    await loadShards(shardsToLoad);
-
-    // Execute search
-    const results = executeSearch(
-      query,
-      decadeFilter,
-      ministerFilter,
-      topicFilter,
-      sortFilter,
-    );
+    const terms = query.match(TOKEN_PATTERN) || [];
+    let results;
+
+    if (canUseInvertedIndex(terms)) {
+      results = await executeIndexedSearch(
+        terms,
+        decadeFilter,
+        ministerFilter,
+        topicFilter,
+        sortFilter,
+      );
+      await loadSentenceTexts(results.slice(0, 100));
+    } else {
+      // Determine which shards to load
+      const shardsToLoad = determineShards(decadeFilter, topicFilter);
+
+      // Load required shards
+      await loadShards(shardsToLoad);
+
+      // Execute search
+      results = executeSearch(
+        query,
+        decadeFilter,
+        ministerFilter,
+        topicFilter,
+        sortFilter,
+      );
+    }
 
     // Display results
     displayResults(results, query);
@@ -225,6 +265,131 @@ function executeSearch(
   return results;
 }
 
+// Query terms shorter than the postings shard prefix (e.g. "a") would need
+// every shard under that letter, so those queries scan the decade shards
+function canUseInvertedIndex(terms) {
+  return (
+    invertedIndex !== null &&
+    terms.length > 0 &&
+    terms.every((term) => term.length >= invertedIndex.prefix_length)
+  );
+}
+
+// Load the postings of every term starting with a prefix (with caching)
+async function loadTermShard(prefix) {
+  if (!termShardCache.has(prefix)) {
+    const request = fetch(`${INVERTED_PATH}/terms/${prefix}.json`).then(
+      // No shard means no indexed term starts with the prefix
+      (response) => (response.ok ? response.json() : {}),
+    );
+    termShardCache.set(prefix, request);
+  }
+  return termShardCache.get(prefix);
+}
+
+// Rank sentences by BM25 using the prebuilt postings. Each query term matches
+// every indexed term it prefixes (so "tax" also finds "taxes", like the shard
+// scan) and a sentence must match all query terms; its score is the sum of the
+// precomputed BM25 weights of the matched terms.
+async function executeIndexedSearch(
+  terms,
+  decadeFilter,
+  ministerFilter,
+  topicFilter,
+  sortFilter,
+) {
+  const shards = await Promise.all(
+    terms.map((term) =>
+      loadTermShard(term.slice(0, invertedIndex.prefix_length)),
+    ),
+  );
+
+  let scores = null;
+  terms.forEach((term, i) => {
+    const termScores = new Map();
+    Object.entries(shards[i]).forEach(([indexedTerm, postings]) => {
+      if (!indexedTerm.startsWith(term)) return;
+      let id = 0;
+      postings.ids.forEach((delta, j) => {
+        id += delta;
+        termScores.set(id, (termScores.get(id) || 0) + postings.w[j]);
+      });
+    });
+
+    if (scores === null) {
+      scores = termScores;
+    } else {
+      const matched = new Map();
+      scores.forEach((score, id) => {
+        if (termScores.has(id)) matched.set(id, score + termScores.get(id));
+      });
+      scores = matched;
+    }
+  });
+
+  const results = [];
+  scores.forEach((score, id) => {
+    const sentence = indexedSentence(id);
+    if (decadeFilter && sentence.decade !== decadeFilter) return;
+    if (ministerFilter && sentence.minister !== ministerFilter) return;
+    if (topicFilter && sentence.topic !== topicFilter) return;
+    sentence.score = score / invertedIndex.bm25.weight_scale;
+    results.push(sentence);
+  });
+
+  sortResults(results, sortFilter);
+  return results;
+}
+
+// Year, minister and topic of a sentence id, from the index metadata alone
+function indexedSentence(id) {
+  const { years, year_starts, ministers, topics, sentence_topics } =
+    invertedIndex;
+
+  // Last year starting at or before id
+  let low = 0;
+  let high = year_starts.length - 1;
+  while (low < high) {
+    const mid = Math.ceil((low + high) / 2);
+    if (year_starts[mid] <= id) low = mid;
+    else high = mid - 1;
+  }
+
+  const year = years[low];
+  return {
+    id,
+    year,
+    decade: `${Math.floor(year / 10) * 10}s`,
+    minister: ministers[low],
+    topic: topics[parseInt(sentence_topics[id], 36)],
+  };
+}
+
+// Fill in the text of indexed results, fetching only the blocks they fall in
+async function loadSentenceTexts(sentences) {
+  const pending = sentences.filter((sentence) => sentence.text === undefined);
+  if (pending.length === 0) return;
+
+  const blockSize = invertedIndex.block_size;
+  const blocks = [...new Set(pending.map((s) => Math.floor(s.id / blockSize)))];
+  await Promise.all(
+    blocks.map((block) => {
+      if (!textBlockCache.has(block)) {
+        const request = fetch(`${INVERTED_PATH}/sentences/${block}.json`).then(
+          (response) => response.json(),
+        );
+        textBlockCache.set(block, request);
+      }
+      return textBlockCache.get(block);
+    }),
+  );
+
+  for (const sentence of pending) {
+    const texts = await textBlockCache.get(Math.floor(sentence.id / blockSize));
+    sentence.text = texts[sentence.id % blockSize];
+  }
+}
+
 // Sort results based on selected option
 function sortResults(results, sortBy) {
   switch (sortBy) {
@@ -394,6 +559,32 @@ async function loadContext(index) {
 
   if (!result) return;
 
+  if (result.id !== undefined) {
+    // Indexed result: neighbouring ids from the same speech
+    const contextRange = 3;
+    const first = Math.max(0, result.id - contextRange);
+    const last = Math.min(
+      invertedIndex.num_sentences - 1,
+      result.id + contextRange,
+    );
+    const neighbours = [];
+    for (let id = first; id <= last; id++) {
+      const sentence = indexedSentence(id);
+      if (sentence.year === result.year) neighbours.push(sentence);
+    }
+
+    try {
+      await loadSentenceTexts(neighbours);
+    } catch (error) {
+      contextDiv.innerHTML = "<em>Failed to load context</em>";
+      return;
+    }
+
+    const currentIdx = neighbours.findIndex((s) => s.id === result.id);
+    renderContext(contextDiv, result, neighbours, currentIdx);
+    return;
+  }
+
   // Get all sentences from the same year in the cache
   const decade = result.decade;
   const shardPath = `decades/${decade}.json`;
@@ -434,11 +625,15 @@ async function loadContext(index) {
 
   const contextSentences = yearSentences.slice(startIdx, endIdx + 1);
 
+  renderContext(contextDiv, result, contextSentences, currentIdx - startIdx);
+}
+
+// Render context sentences, highlighting the one at currentIdx
+function renderContext(contextDiv, result, contextSentences, currentIdx) {
   // Build context HTML
   const contextHtml = contextSentences
     .map((sentence, i) => {
-      const actualIdx = startIdx + i;
-      const isCurrent = actualIdx === currentIdx;
+      const isCurrent = i === currentIdx;
       const text = isCurrent
         ? highlightQuery(sentence.text, window.currentQuery)
         : sentence.text;
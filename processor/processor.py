@@ -3,6 +3,7 @@ Main processor for batch processing speeches (one parquet per year)
 """
 
 import logging
+import sys
 from parser import SpeechParser  # type: ignore[attr-defined]
 from pathlib import Path
 from typing import List, Optional
@@ -15,6 +16,11 @@ from writer import (
     write_year_to_parquet,
 )
 
+# Add analysis to path for the per-sentence linguistic features
+sys.path.append(str(Path(__file__).parent.parent / "analysis"))
+
+from linguistic_features import annotate_parquet_file  # type: ignore[import]  # noqa: E402
+
 logger = logging.getLogger(__name__)
 
 
@@ -97,8 +103,9 @@ def process_speeches(
             # Prepare DataFrame for this year
             df_final = prepare_dataframe_for_year(sentences_deduped, year)
 
-            # Write to parquet
+            # Write to parquet, then add per-sentence linguistic feature columns
             output_path_written = write_year_to_parquet(df_final, year, output_dir)
+            annotate_parquet_file(output_path_written)
 
             if duplicates_in_year > 0:
                 logger.info(
@@ -7,6 +7,8 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +63,52 @@ def write_year_to_parquet(
     return file_path
 
 
+def update_parquet_columns(
+    file_path: Path, columns: pd.DataFrame, metadata: Optional[Dict[bytes, bytes]] = None
+) -> Path:
+    """
+    Add or replace columns of a year parquet in place
+
+    Other columns and schema metadata (such as fingerprints written by other stages)
+    are kept, so derived columns from different stages can live in the same file.
+
+    Args:
+        file_path: Parquet file to update
+        columns: Columns to write, one row per sentence in file order
+        metadata: Extra schema metadata entries to set
+
+    Returns:
+        Path to written file
+    """
+    table = pq.read_table(file_path)
+    table = table.select([name for name in table.column_names if name not in columns.columns])
+    for name in columns.columns:
+        table = table.append_column(name, pa.array(columns[name].to_numpy()))
+
+    # pandas' own metadata describes the old column set, so let it be rebuilt on read
+    merged = {
+        key: value for key, value in (table.schema.metadata or {}).items() if key != b"pandas"
+    }
+    merged.update(metadata or {})
+    pq.write_table(table.replace_schema_metadata(merged), file_path)
+    return file_path
+
+
+def read_parquet_metadata(file_path: Path, key: bytes) -> str:
+    """
+    Read one schema metadata entry of a parquet file
+
+    Args:
+        file_path: Parquet file to inspect
+        key: Metadata key
+
+    Returns:
+        Decoded value, or an empty string if the key is absent
+    """
+    metadata = pq.read_schema(file_path).metadata or {}
+    return metadata.get(key, b"").decode()
+
+
 def load_all_years(output_dir: str = "output_processor") -> pd.DataFrame:
     """
     Load all year parquet files and combine them